@@ -1,4 +1,6 @@
-from pydantic_settings import BaseSettings  # Use pydantic_settings instead of pydantic
+from pydantic_settings import BaseSettings, SettingsConfigDict  # Use pydantic_settings instead of pydantic
+from functools import lru_cache
+from typing import Optional
 import os
 from dotenv import load_dotenv
 
@@ -8,11 +10,20 @@ load_dotenv()
 class Settings(BaseSettings):
     # Database Configuration
     DATABASE_URL: str
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30  # Seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 3600  # Reconnect connections older than this (seconds)
+    DB_USE_NULLPOOL: bool = False  # Set when PgBouncer (transaction mode) does the pooling
+    DB_QUERY_CACHE_SIZE: int = 1200  # Compiled-statement LRU entries per engine
+    QUERY_COUNT_WARNING_THRESHOLD: int = 0  # Log requests issuing more queries than this; 0 disables
 
     # JWT Authentication
     SECRET_KEY: str
     ALGORITHM: str = "HS256"  # Default value for algorithm
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440  # Default value of 24 hours
+    OTP_EXPIRE_MINUTES: int = 10  # Signup OTPs stop verifying after this
+    BCRYPT_ROUNDS: int = 12  # Password hashing cost; lower only for dev/test
 
     # Email Configuration (Hostinger SMTP)
     SMTP_SERVER: str
@@ -22,12 +33,24 @@ class Settings(BaseSettings):
     EMAIL_FROM: str
     FRONTEND_URL: str = 'http://meetyfi.eplsio.com'
 
-    class Config:
-        # The env_file tells pydantic where to load environment variables from
-        env_file = ".env"
+    # CORS: comma-separated list of allowed origins ("*" allows any)
+    ALLOWED_ORIGINS: str = "*"
+
+    # Worker threads for sync route handlers. Every handler holds a pooled DB
+    # connection, so unset means DB_POOL_SIZE + DB_MAX_OVERFLOW; more threads
+    # than connections would only queue in the pool and time out as 500s
+    THREADPOOL_SIZE: Optional[int] = None
+
+    # The env_file tells pydantic where to load environment variables from
+    model_config = SettingsConfigDict(env_file=".env")
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Build the settings once per process; later calls reuse the parsed .env"""
+    return Settings()
 
 # Instantiate the settings object
-settings = Settings()
+settings = get_settings()
 
 # Optional: You can add custom validations for the environment variables if needed
 if not settings.SECRET_KEY:
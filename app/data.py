@@ -1,16 +1,56 @@
-from sqlalchemy import create_engine
+from contextvars import ContextVar
+from typing import List, Optional
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from app.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Create the database engine. Behind PgBouncer in transaction mode the bouncer
+# multiplexes connections, so we open a fresh one per checkout instead of
+# holding a pool of our own.
+if settings.DB_USE_NULLPOOL:
+    engine = create_engine(
+        settings.DATABASE_URL,
+        poolclass=NullPool,
+        pool_pre_ping=True,
+        query_cache_size=settings.DB_QUERY_CACHE_SIZE
+    )
+else:
+    engine = create_engine(
+        settings.DATABASE_URL,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_pre_ping=True,  # Replace connections dropped by the server before use
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        query_cache_size=settings.DB_QUERY_CACHE_SIZE
+    )
+
+# Compiled SQL is only reused when the dialect opts in; a dialect without the
+# flag silently recompiles every statement, so make that visible at startup
+if not getattr(engine.dialect, "supports_statement_cache", False):
+    logger.warning(
+        "Dialect %s does not support the compiled statement cache; "
+        "queries will be recompiled on every execution",
+        engine.dialect.name
+    )
 
-# Create the database engine with updated connection pool parameters
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_size=10,        # Increase from default 5
-    max_overflow=20,     # Increase from default 10
-    pool_timeout=60,     # Increase timeout if needed
-    pool_recycle=3600    # Recycle connections after 1 hour
-)
+# Per-request statement counter used to spot N+1 regressions. The middleware
+# puts a fresh list in the context; the sync handlers run in worker threads
+# with a copy of that context, so they append to the same list.
+query_counter: ContextVar[Optional[List[int]]] = ContextVar("query_counter", default=None)
+
+@event.listens_for(engine, "before_cursor_execute")
+def count_query(conn, cursor, statement, parameters, context, executemany):
+    counter = query_counter.get()
+    if counter is not None:
+        counter[0] += 1
 
 # Create a session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -22,10 +62,28 @@ Base = declarative_base()
 def create_tables():
     Base.metadata.create_all(bind=engine)
 
+# Function to create indexes declared on the models that the database is missing.
+# create_all only builds new tables, so indexes added to existing tables are
+# created here on startup.
+def create_indexes():
+    # The trigram search indexes need pg_trgm; without it only they fail below
+    try:
+        with engine.begin() as conn:
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    except SQLAlchemyError as e:
+        logger.error(f"Failed to enable pg_trgm: {str(e)}")
+
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            try:
+                index.create(bind=engine, checkfirst=True)
+            except SQLAlchemyError as e:
+                logger.error(f"Failed to create index {index.name}: {str(e)}")
+
 # Function to get a database session
 def get_db_session():
     db = SessionLocal()  # Create a new session
     try:
-        return db  # Return the session object
+        yield db  # Hand the session to the caller
     finally:
-        db.close()  # Close the session after use
\ No newline at end of file
+        db.close()  # Close the session once the request is done
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Float, Text, Enum
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Float, Text, Enum, Index, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -56,6 +56,18 @@ class ProposedDate(Base):
 
 class Employee(Base):
     __tablename__ = "employees"
+    __table_args__ = (
+        # Employee listing: a manager's employees newest first, keyset on (created_at, id)
+        Index("ix_employees_manager_created_at_id", "manager_id", "created_at", "id"),
+        # Trigram indexes so the unanchored ILIKE '%term%' search can use an index
+        Index("ix_employees_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index("ix_employees_email_trgm", "email", postgresql_using="gin", postgresql_ops={"email": "gin_trgm_ops"}),
+        Index("ix_employees_role_trgm", "role", postgresql_using="gin", postgresql_ops={"role": "gin_trgm_ops"}),
+        Index(
+            "ix_employees_department_trgm", "department",
+            postgresql_using="gin", postgresql_ops={"department": "gin_trgm_ops"}
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String, unique=True, index=True)
@@ -66,8 +78,8 @@ class Employee(Base):
     phone = Column(String, nullable=True)
     profile_picture = Column(String, nullable=True)
     is_verified = Column(Boolean, default=False)
-    verification_token = Column(String, nullable=True)
-    manager_id = Column(Integer, ForeignKey("managers.id"))
+    verification_token = Column(String, index=True, nullable=True)  # HMAC digest, never the plain token
+    manager_id = Column(Integer, ForeignKey("managers.id"))  # Indexed via ix_employees_manager_created_at_id
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     token_expiry = Column(DateTime, nullable=True)
@@ -78,9 +90,15 @@ class Employee(Base):
 
 class Location(Base):
     __tablename__ = "locations"
+    __table_args__ = (
+        # Latest location per employee (DISTINCT ON employee_id, newest first)
+        Index("ix_locations_employee_timestamp", "employee_id", text("timestamp DESC")),
+        # Time-window pruning; fixes are appended in time order, so BRIN stays tiny
+        Index("ix_locations_timestamp_brin", "timestamp", postgresql_using="brin"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    employee_id = Column(Integer, ForeignKey("employees.id"))
+    employee_id = Column(Integer, ForeignKey("employees.id"))  # Indexed via ix_locations_employee_timestamp
     latitude = Column(Float)
     longitude = Column(Float)
     address = Column(String)
@@ -90,6 +108,14 @@ class Location(Base):
 
 class Meeting(Base):
     __tablename__ = "meetings"
+    __table_args__ = (
+        # Employee listing: meetings created by a user, newest first
+        Index("ix_meetings_created_by_created_at", "created_by_id", "created_by_type", "created_at"),
+        # Status-filtered listings ordered by meeting date
+        Index("ix_meetings_status_date", "status", "date"),
+        # Manager meeting listing ordered by date, keyset on (date, id)
+        Index("ix_meetings_manager_date_id", "manager_id", "date", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String)
@@ -101,7 +127,7 @@ class Meeting(Base):
     rejection_reason = Column(String, nullable=True)
     created_by_id = Column(Integer, nullable=True)
     created_by_type = Column(String)
-    manager_id = Column(Integer, ForeignKey("managers.id"))
+    manager_id = Column(Integer, ForeignKey("managers.id"))  # Indexed via ix_meetings_manager_date_id
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -114,12 +140,21 @@ class Meeting(Base):
     employees = relationship("EmployeeMeeting", back_populates="meeting")
     proposed_dates = relationship("ProposedDate", back_populates="meeting", cascade="all, delete-orphan")
 
+    @property
+    def client_info(self):
+        """Client fields grouped the way the API responses expose them"""
+        return {
+            "name": self.client_name,
+            "email": self.client_email,
+            "phone": self.client_phone
+        }
+
 class EmployeeMeeting(Base):
     __tablename__ = "employee_meetings"
 
     id = Column(Integer, primary_key=True, index=True)
-    employee_id = Column(Integer, ForeignKey("employees.id"))
-    meeting_id = Column(Integer, ForeignKey("meetings.id"))
+    employee_id = Column(Integer, ForeignKey("employees.id"), index=True)
+    meeting_id = Column(Integer, ForeignKey("meetings.id"), index=True)
 
     employee = relationship("Employee", back_populates="meetings")
     meeting = relationship("Meeting", back_populates="employees")
@@ -6,14 +6,10 @@ from app.config import settings
 from app.utils.security import verify_token
 from app.data import get_db_session
 
-def get_db():
-    db = get_db_session()  # Ensure this function returns a Session object, not a generator
-    try:
-        return db
-    finally:
-        db.close()
+# Request-scoped session dependency; FastAPI closes it after the response
+get_db = get_db_session
 
-async def get_current_user(authorization: str = Header(...), db: Session = Depends(get_db)):
+def get_current_user(authorization: str = Header(...), db: Session = Depends(get_db)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -28,18 +24,27 @@ async def get_current_user(authorization: str = Header(...), db: Session = Depen
 
     try:
         payload = verify_token(token)
-        user_id: int = payload.get("sub")
         user_type: str = payload.get("type")
 
-        if user_id is None or user_type is None:
+        if payload.get("sub") is None or user_type is None:
+            raise credentials_exception
+
+        # Tokens carry the id as a string; convert once so lookups compare
+        # integer to integer instead of casting per query
+        try:
+            user_id = int(payload["sub"])
+        except ValueError:
             raise credentials_exception
 
+        # get() goes through the session's identity map; routes share this
+        # request's session, so services re-fetching the current user by id
+        # get the loaded object back without another SELECT
         if user_type == UserType.MANAGER:
-            user = db.query(Manager).filter(Manager.id == user_id).first()
+            user = db.get(Manager, user_id)
         elif user_type == UserType.EMPLOYEE:
-            user = db.query(Employee).filter(Employee.id == user_id).first()
+            user = db.get(Employee, user_id)
         elif user_type == UserType.ADMIN:
-            user = db.query(Admin).filter(Admin.id == user_id).first()
+            user = db.get(Admin, user_id)
         else:
             raise credentials_exception
 
@@ -50,7 +55,7 @@ async def get_current_user(authorization: str = Header(...), db: Session = Depen
     except JWTError:
         raise credentials_exception
 
-async def get_current_manager(current_user = Depends(get_current_user)):
+def get_current_manager(current_user = Depends(get_current_user)):
     if not isinstance(current_user, Manager):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -58,7 +63,7 @@ async def get_current_manager(current_user = Depends(get_current_user)):
         )
     return current_user
 
-async def get_current_employee(current_user = Depends(get_current_user)):
+def get_current_employee(current_user = Depends(get_current_user)):
     if not isinstance(current_user, Employee):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -66,7 +71,7 @@ async def get_current_employee(current_user = Depends(get_current_user)):
         )
     return current_user
 
-async def get_current_admin(current_user = Depends(get_current_user)):
+def get_current_admin(current_user = Depends(get_current_user)):
     if not isinstance(current_user, Admin):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
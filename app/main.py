@@ -1,31 +1,17 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+import anyio
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from app.data import SessionLocal
+from fastapi.middleware.gzip import GZipMiddleware
+from app.config import settings
+from app.data import engine, SessionLocal, create_indexes, query_counter
 from app.routers import auth, managers, employees, admin
 from sqlalchemy.orm import Session
 from app.utils.password import hash_password
 from app.database import Admin
+import logging
 
-app = FastAPI(
-    title="Meetyfi-Backend",
-    description="API for managing meetings between managers and employees",
-    version="1.0.0"
-)
-
-# Configure CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # In production, specify actual origins
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Include routers
-app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
-app.include_router(managers.router, prefix="/api/managers", tags=["Managers"])
-app.include_router(employees.router, prefix="/api/employees", tags=["Employees"])
-app.include_router(admin.router, prefix="/api/admin", tags=["Admin"])
+logger = logging.getLogger(__name__)
 
 def create_default_admin():
     db: Session = SessionLocal()
@@ -44,10 +30,70 @@ def create_default_admin():
         print("Admin already exists.")
     db.close()
 
-@app.on_event("startup")
-def startup_event():
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Routes and services use the sync Session, so every request holds a
+    # worker thread and a pooled connection while it waits on the database.
+    # Keep the threads at or below the connection pool: surplus requests then
+    # queue in anyio instead of timing out in the pool.
+    pool_capacity = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    threadpool_size = settings.THREADPOOL_SIZE or pool_capacity
+    if not settings.DB_USE_NULLPOOL and threadpool_size > pool_capacity:
+        logger.warning(
+            f"THREADPOOL_SIZE={threadpool_size} exceeds the DB pool ({pool_capacity}); "
+            f"capping it to {pool_capacity}"
+        )
+        threadpool_size = pool_capacity
+    anyio.to_thread.current_default_thread_limiter().total_tokens = threadpool_size
+    create_indexes()
     create_default_admin()
-    
+    yield
+    # The engine and its pool live for the whole process; release them on shutdown
+    engine.dispose()
+
+app = FastAPI(
+    title="Meetyfi-Backend",
+    description="API for managing meetings between managers and employees",
+    version="1.0.0",
+    lifespan=lifespan
+)
+
+# Configure CORS
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=[origin.strip() for origin in settings.ALLOWED_ORIGINS.split(",") if origin.strip()],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+# Compress list responses; small payloads are sent as-is
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
+# Flag requests that issue more SQL statements than expected, which is how an
+# N+1 loop shows up. Statements run after the response has started (background
+# tasks, streamed bodies) are not counted.
+if settings.QUERY_COUNT_WARNING_THRESHOLD > 0:
+    @app.middleware("http")
+    async def count_queries(request: Request, call_next):
+        counter = [0]
+        token = query_counter.set(counter)
+        try:
+            response = await call_next(request)
+        finally:
+            query_counter.reset(token)
+        if counter[0] > settings.QUERY_COUNT_WARNING_THRESHOLD:
+            logger.warning(
+                f"{request.method} {request.url.path} issued {counter[0]} queries "
+                f"(threshold {settings.QUERY_COUNT_WARNING_THRESHOLD})"
+            )
+        return response
+
+# Include routers
+app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
+app.include_router(managers.router, prefix="/api/managers", tags=["Managers"])
+app.include_router(employees.router, prefix="/api/employees", tags=["Employees"])
+app.include_router(admin.router, prefix="/api/admin", tags=["Admin"])
 
 @app.get("/")
 async def root():
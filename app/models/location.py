@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from typing import Optional
 from datetime import datetime
 
@@ -15,8 +15,7 @@ class LocationInDB(LocationBase):
     employee_id: int
     timestamp: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class EmployeeLocation(BaseModel):
     employee_id: int
@@ -26,8 +25,7 @@ class EmployeeLocation(BaseModel):
     address: str
     timestamp: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class EmployeeLocationResponse(BaseModel):
     employee_locations: list[EmployeeLocation]
\ No newline at end of file
@@ -28,4 +28,4 @@ class MeetingCreate(MeetingBase):
     employee_ids: Optional[List[int]] = None  # Optional for manager-created meetings
 
 class MeetingRequest(MeetingBase):
-    proposed_dates: List[datetime] = Field(..., min_items=1, max_items=5)
\ No newline at end of file
+    proposed_dates: List[datetime] = Field(..., min_length=1, max_length=5)
\ No newline at end of file
@@ -1,10 +1,12 @@
-from pydantic import BaseModel, EmailStr, Field, field_validator
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
 from typing import Optional, List
 from datetime import datetime
 import re
 
 from app.utils.validators import validate_email, validate_password, validate_phone
 
+PHONE_PATTERN = re.compile(r'^\+?[1-9]\d{1,14}$')
+
 class UserBase(BaseModel):
     email: EmailStr
     name: str = Field(..., min_length=2, max_length=100)
@@ -33,7 +35,7 @@ class ManagerBase(UserBase):
     def validate_phone(cls, v):
         # This is likely where the validation happens
         # Check what format is expected here
-        if not re.match(r'^\+?[1-9]\d{1,14}$', v):
+        if not PHONE_PATTERN.match(v):
             raise ValueError('Invalid phone number format')
         return v
 
@@ -47,8 +49,7 @@ class ManagerInDB(ManagerBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
     
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class ManagerUpdate(BaseModel):
     name: Optional[str] = Field(None, min_length=2, max_length=100)
@@ -83,8 +84,7 @@ class EmployeeInDB(EmployeeBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
     
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class EmployeeUpdate(BaseModel):
     name: Optional[str] = Field(None, min_length=2, max_length=100)
@@ -106,5 +106,4 @@ class AdminInDB(UserBase):
     id: int
     created_at: datetime
     
-    class Config:
-        orm_mode = True
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
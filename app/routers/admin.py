@@ -15,7 +15,7 @@ from app.dependencies import get_db, get_current_admin
 router = APIRouter()
 
 @router.get("/managers/requests", response_model=ManagerRequestListResponse)
-async def list_manager_requests(
+def list_manager_requests(
     status: Optional[str] = None,
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
@@ -27,7 +27,7 @@ async def list_manager_requests(
     return get_manager_requests(db, status, skip, limit)
 
 @router.put("/managers/{manager_id}/status")
-async def update_manager_request(
+def update_manager_request(
     manager_id: int,
     status_update: ManagerStatusUpdateRequest,
     current_admin = Depends(get_current_admin),
@@ -38,7 +38,7 @@ async def update_manager_request(
     return {"message": f"Manager {status_update.status} successfully"}
 
 @router.get("/managers", response_model=ManagerListResponse)
-async def list_managers(
+def list_managers(
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
     current_admin = Depends(get_current_admin),
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
 from fastapi.security import HTTPBearer
 from sqlalchemy.orm import Session
 from typing import Optional
@@ -13,38 +13,39 @@ from app.services.auth_service import (
     register_manager, verify_manager_otp,
     login_user, verify_employee
 )
-from app.dependencies import get_db_session
+from app.dependencies import get_db
 
 router = APIRouter()
 
 @router.post("/manager/signup", response_model=ManagerSignupResponse)
-async def signup_manager(
+def signup_manager(
     request: ManagerSignupRequest,
-    db: Session = Depends(get_db_session)
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db)
 ):
     """Register a new manager"""
-    return register_manager(db, request)
+    return register_manager(db, request, background_tasks)
 
 @router.post("/verify-otp", response_model=VerifyOTPResponse)
-async def verify_otp(
+def verify_otp(
     request: VerifyOTPRequest,
-    db: Session = Depends(get_db_session)
+    db: Session = Depends(get_db)
 ):
     """Verify OTP for manager signup"""
     return verify_manager_otp(db, request)
 
 @router.post("/login", response_model=LoginResponse)
-async def login(
+def login(
     request: LoginRequest,
-    db: Session = Depends(get_db_session)
+    db: Session = Depends(get_db)
 ):
     """Login for managers and employees"""
     return login_user(db, request)
 
 @router.post("/employee/verify", response_model=EmployeeVerifyResponse)
-async def verify_employee_account(
+def verify_employee_account(
     request: EmployeeVerifyRequest,
-    db: Session = Depends(get_db_session)
+    db: Session = Depends(get_db)
 ):
     """Employee verification and password setup"""
     return verify_employee(db, request)
\ No newline at end of file
@@ -1,7 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, BackgroundTasks
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from datetime import date
+from datetime import date, time
 
 from app.schemas.employee import (
     EmployeeProfileResponse, EmployeeProfileUpdate,
@@ -19,7 +19,7 @@ from app.dependencies import get_db, get_current_employee
 router = APIRouter()
 
 @router.get("/profile", response_model=EmployeeProfileResponse)
-async def get_profile(
+def get_profile(
     current_employee = Depends(get_current_employee),
     db: Session = Depends(get_db)
 ):
@@ -27,7 +27,7 @@ async def get_profile(
     return get_employee_profile(db, current_employee.id)
 
 @router.put("/profile", response_model=EmployeeProfileResponse)
-async def update_profile(
+def update_profile(
     profile_update: EmployeeProfileUpdate,
     current_employee = Depends(get_current_employee),
     db: Session = Depends(get_db)
@@ -36,7 +36,7 @@ async def update_profile(
     return update_employee_profile(db, current_employee.id, profile_update)
 
 @router.get("/managers", response_model=ManagerResponse)
-async def get_manager(
+def get_manager(
     current_employee = Depends(get_current_employee),
     db: Session = Depends(get_db)
 ):
@@ -44,16 +44,16 @@ async def get_manager(
     return get_manager_details(db, current_employee.id)
 
 @router.get("/managers/availability", response_model=ManagerAvailabilityResponse)
-async def get_availability(
+def get_availability(
     date: date = Query(..., description="Date to check availability (YYYY-MM-DD)"),
-    time: str = Query(..., description="Time to check availability (HH:MM)"),
+    time_str: str = Query(..., alias="time", description="Time to check availability (HH:MM)"),
     current_employee = Depends(get_current_employee),
     db: Session = Depends(get_db)
 ):
     """Get manager availability for a specific date and time"""
     # Parse the time string to a time object
     try:
-        hour, minute = map(int, time.split(':'))
+        hour, minute = map(int, time_str.split(':'))
         time_obj = time(hour=hour, minute=minute)
     except (ValueError, TypeError):
         raise HTTPException(
@@ -61,10 +61,10 @@ async def get_availability(
             detail="Invalid time format. Please use HH:MM format (e.g., 14:30)"
         )
     
-    return get_manager_availability(db, current_employee.id, date, time_obj)
+    return get_manager_availability(db, current_employee.manager_id, date, time_obj)
 
 @router.post("/location", response_model=dict)
-async def create_location(
+def create_location(
     location: LocationCreateRequest,
     current_employee = Depends(get_current_employee),
     db: Session = Depends(get_db)
@@ -74,17 +74,18 @@ async def create_location(
     return {"message": "Location updated successfully", "location_id": location_id}
 
 @router.post("/meetings", response_model=dict)
-async def create_meeting_request(
+def create_meeting_request(
     meeting: MeetingRequestCreate,
+    background_tasks: BackgroundTasks,
     current_employee = Depends(get_current_employee),
     db: Session = Depends(get_db)
 ):
     """Request a meeting with manager and client"""
-    meeting_id = request_meeting(db, current_employee.id, meeting)
+    meeting_id = request_meeting(db, current_employee.id, meeting, background_tasks)
     return {"message": "Meeting request with client sent successfully", "meeting_id": meeting_id}
 
 @router.get("/meetings", response_model=MeetingListResponse)
-async def list_meetings(
+def list_meetings(
     status: Optional[str] = None,
     date_from: Optional[date] = None,
     date_to: Optional[date] = None,
@@ -94,4 +95,7 @@ async def list_meetings(
     db: Session = Depends(get_db)
 ):
     """Get all meetings"""
-    return get_employee_meetings(db, current_employee.id, status, date_from, date_to, page, limit)
\ No newline at end of file
+    return get_employee_meetings(
+        db, current_employee.id, page=page, limit=limit, status=status,
+        date_from=date_from, date_to=date_to
+    )
\ No newline at end of file
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, BackgroundTasks
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import date
@@ -6,13 +7,13 @@ from datetime import date
 from app.schemas.manager import (
     ManagerProfileResponse, ManagerProfileUpdate,
     EmployeeCreateRequest, EmployeeResponse, EmployeeListResponse,
-    EmployeeLocationResponse, MeetingCreateRequest, MeetingResponse,
+    MeetingCreateRequest, MeetingResponse,
     MeetingListResponse, MeetingStatusUpdateRequest
 )
 from app.services.manager_service import (
     get_manager_profile, update_manager_profile,
     add_employee, get_employees, get_employee_by_id,
-    delete_employee, get_employee_locations,
+    delete_employee, stream_employee_locations,
     create_meeting, get_meetings, update_meeting_status, delete_meeting
     
 )
@@ -26,7 +27,7 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 @router.get("/profile", response_model=ManagerProfileResponse)
-async def get_profile(
+def get_profile(
     current_manager = Depends(get_current_manager),
     db: Session = Depends(get_db)
 ):
@@ -34,7 +35,7 @@ async def get_profile(
     return get_manager_profile(db, current_manager.id)
 
 @router.put("/profile", response_model=ManagerProfileResponse)
-async def update_profile(
+def update_profile(
     profile_update: ManagerProfileUpdate,
     current_manager = Depends(get_current_manager),
     db: Session = Depends(get_db)
@@ -43,19 +44,22 @@ async def update_profile(
     return update_manager_profile(db, current_manager.id, profile_update)
 
 @router.post("/employees", response_model=dict)
-async def create_employee(
+def create_employee(
     employee: EmployeeCreateRequest,
+    background_tasks: BackgroundTasks,
     current_manager = Depends(get_current_manager),
     db: Session = Depends(get_db)
 ):
     """Add a new employee"""
     try:
-        employee_id = add_employee(db, current_manager.id, employee)
+        employee_id = add_employee(db, current_manager.id, employee, background_tasks)
         return {
             "message": "Employee added successfully",
             "employee_id": employee_id,
             "email_sent": True
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error creating employee: {str(e)}")
         if "email" in str(e).lower():
@@ -69,17 +73,32 @@ async def create_employee(
         raise
 
 @router.get("/employees", response_model=EmployeeListResponse)
-async def list_employees(
+def list_employees(
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None,
     current_manager = Depends(get_current_manager),
     db: Session = Depends(get_db)
 ):
     """Get all employees under a manager"""
-    return get_employees(db, current_manager.id, page, limit)
+    return get_employees(db, current_manager.id, page, limit, cursor=cursor)
+
+# Registered before /employees/{employee_id} so "locations" is not parsed as an ID
+@router.get("/employees/locations")
+def view_employee_locations(
+    current_manager = Depends(get_current_manager),
+    db: Session = Depends(get_db)
+):
+    """View employee locations"""
+    # Streamed from a server-side cursor in batches; the body has the shape
+    # of EmployeeLocationResponse
+    return StreamingResponse(
+        stream_employee_locations(db, current_manager.id),
+        media_type="application/json"
+    )
 
 @router.get("/employees/{employee_id}", response_model=EmployeeResponse)
-async def get_employee(
+def get_employee(
     employee_id: int,
     current_manager = Depends(get_current_manager),
     db: Session = Depends(get_db)
@@ -89,7 +108,7 @@ async def get_employee(
     return get_employee_by_id(db, current_manager.id, employee_id)
 
 @router.delete("/employees/{employee_id}")
-async def remove_employee(
+def remove_employee(
     employee_id: int,
     current_manager = Depends(get_current_manager),
     db: Session = Depends(get_db)
@@ -103,55 +122,51 @@ async def remove_employee(
 
     return {"message": "Employee deleted successfully"}
 
-@router.get("/employees/locations", response_model=EmployeeLocationResponse)
-async def view_employee_locations(
-    date: Optional[date] = None,
-    current_manager = Depends(get_current_manager),
-    db: Session = Depends(get_db)
-):
-    """View employee locations"""
-    return get_employee_locations(db, current_manager.id, date)
-
 @router.get("/meetings", response_model=MeetingListResponse)
-async def list_meetings(
+def list_meetings(
     status: Optional[str] = None,
     date_from: Optional[date] = None,
     date_to: Optional[date] = None,
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None,
+    employee_id: Optional[int] = None,
     current_manager = Depends(get_current_manager),
     db: Session = Depends(get_db)
 ):
     """View all meetings"""
-    return get_meetings(db, current_manager.id, status, date_from, date_to, page, limit)
+    return get_meetings(db, current_manager.id, status, date_from, date_to, page, limit, cursor, employee_id)
 
 @router.post("/meetings", response_model=dict)
-async def schedule_meeting(
+def schedule_meeting(
     meeting: MeetingCreateRequest,
+    background_tasks: BackgroundTasks,
     current_manager = Depends(get_current_manager),
     db: Session = Depends(get_db)
 ):
     """Create a new meeting with a client"""
-    meeting_id = create_meeting(db, current_manager.id, meeting)
+    meeting_id = create_meeting(db, current_manager.id, meeting, background_tasks)
     return {"message": "Meeting created successfully", "meeting_id": meeting_id}
 
 @router.put("/meetings/{meeting_id}/status", response_model=dict)
-async def update_meeting(
+def update_meeting(
     meeting_id: int,
     status_update: MeetingStatusUpdateRequest,
+    background_tasks: BackgroundTasks,
     current_manager = Depends(get_current_manager),
     db: Session = Depends(get_db)
 ):
     """Accept or reject meeting"""
-    meeting = update_meeting_status(db, current_manager.id, meeting_id, status_update)
+    meeting = update_meeting_status(db, current_manager.id, meeting_id, status_update, background_tasks)
     return {"message": f"Meeting {status_update.status}", "meeting": meeting}
 
 @router.delete("/meetings/{meeting_id}")
-async def cancel_meeting(
+def cancel_meeting(
     meeting_id: int,
+    background_tasks: BackgroundTasks,
     current_manager = Depends(get_current_manager),
     db: Session = Depends(get_db)
 ):
     """Cancel a meeting"""
-    delete_meeting(db, current_manager.id, meeting_id)
+    delete_meeting(db, current_manager.id, meeting_id, background_tasks)
     return {"message": "Meeting cancelled successfully"}
\ No newline at end of file
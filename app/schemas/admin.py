@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from enum import Enum
@@ -17,9 +17,7 @@ class ManagerRequestItem(BaseModel):
     is_verified: bool
     created_at: datetime
 
-    class Config:
-        orm_mode = True
-        from_attributes = True 
+    model_config = ConfigDict(from_attributes=True)
 
 class ManagerRequestListResponse(BaseModel):
     requests: List[ManagerRequestItem]
@@ -1,6 +1,6 @@
-from pydantic import BaseModel, EmailStr, Field, field_validator
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
 from typing import Optional, List, Dict, Any
-from datetime import datetime, date
+from datetime import datetime
 from enum import Enum
 
 from app.utils.validators import validate_phone, validate_proposed_dates
@@ -70,7 +70,7 @@ class MeetingStatus(str, Enum):
 class MeetingRequestCreate(BaseModel):
     title: str = Field(..., min_length=3, max_length=100)
     description: Optional[str] = None
-    proposed_dates: List[datetime] = Field(..., min_items=1, max_items=5)
+    proposed_dates: List[datetime] = Field(..., min_length=1, max_length=5)
     duration: int = Field(..., gt=0, le=480)  # Max 8 hours
     location: Optional[str] = None
     client_info: ClientInfo  # Added client information
@@ -85,19 +85,32 @@ class ClientInfoResponse(BaseModel):
     email: str
     phone: Optional[str] = None
 
+    model_config = ConfigDict(from_attributes=True)
+
+class MeetingManagerInfo(BaseModel):
+    id: int
+    name: str
+    email: str
+    company_name: Optional[str] = None
+    profile_picture: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
 class MeetingResponse(BaseModel):
     id: int
     title: str
     description: Optional[str] = None
-    date: datetime
+    date: Optional[datetime] = None  # Unset until a proposed date is selected
     duration: int
     location: Optional[str] = None
     status: MeetingStatus
     rejection_reason: Optional[str] = None
-    manager: Dict[str, Any]  # Basic manager info
+    manager: MeetingManagerInfo  # Basic manager info
     client_info: ClientInfoResponse  # Added client information
     created_at: datetime
 
+    model_config = ConfigDict(from_attributes=True)
+
 class MeetingListResponse(BaseModel):
     meetings: List[MeetingResponse]
     total: int
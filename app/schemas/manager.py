@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr, Field, field_validator
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
 from typing import Optional, List, Dict, Any
 from datetime import datetime, date
 from enum import Enum
@@ -41,8 +41,7 @@ class LocationData(BaseModel):
     address: str
     timestamp: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class EmployeeResponse(BaseModel):
     id: int
@@ -56,14 +55,14 @@ class EmployeeResponse(BaseModel):
     created_at: datetime
     location: Optional[LocationData] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class EmployeeListResponse(BaseModel):
     employees: List[EmployeeResponse]
     total: int
     page: int
     limit: int
+    next_cursor: Optional[str] = None  # Pass back as cursor for the next page
 
 # Employee locations
 class EmployeeLocationItem(BaseModel):
@@ -131,6 +130,7 @@ class MeetingListResponse(BaseModel):
     total: int
     page: int
     limit: int
+    next_cursor: Optional[str] = None  # Pass back as cursor for the next page
 
 class MeetingStatusUpdateRequest(BaseModel):
     status: str  # Use str instead of enum to avoid case issues
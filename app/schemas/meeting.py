@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr, Field, field_validator
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from enum import Enum
@@ -36,7 +36,7 @@ class MeetingCreateRequest(MeetingBase):
 
 # For creating a meeting request by an employee
 class MeetingRequestCreate(MeetingBase):
-    proposed_dates: List[datetime] = Field(..., min_items=1, max_items=5)
+    proposed_dates: List[datetime] = Field(..., min_length=1, max_length=5)
 
     @field_validator('proposed_dates')
     def validate_dates(cls, v):
@@ -53,7 +53,7 @@ class MeetingStatusUpdate(BaseModel):
     reason: Optional[str] = None
 
     @field_validator('status')
-    def validate_status(cls, v, values, **kwargs):
+    def validate_status(cls, v):
         if v not in [MeetingStatus.ACCEPTED, MeetingStatus.REJECTED, MeetingStatus.CANCELLED]:
             raise ValueError(f"Invalid status: {v}")
         return v
@@ -100,8 +100,7 @@ class MeetingResponse(BaseModel):
     employees: Optional[List[EmployeeInMeeting]] = None
     manager: Optional[ManagerInMeeting] = None
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Meeting list response with pagination
 class MeetingListResponse(BaseModel):
@@ -155,8 +154,7 @@ class CalendarEvent(BaseModel):
     description: Optional[str] = None
     client_name: str  # Added client name for calendar events
     
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Calendar events response
 class CalendarEventsResponse(BaseModel):
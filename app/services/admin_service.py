@@ -1,7 +1,7 @@
 from typing import List, Dict, Any, Optional
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 from app.database import Manager, Employee, Meeting, MeetingStatus
 from app.exceptions import CustomException
@@ -35,11 +35,9 @@ def get_manager_requests(db: Session, status: Optional[str] = None, skip: int =
     # Get the list of manager requests (with pagination)
     managers = query.offset(skip).limit(limit).all()
 
-    # Convert Manager objects to ManagerRequestItem Pydantic models
-    manager_requests = []
-    for manager in managers:
-        # Create a dictionary with the required fields
-        manager_dict = {
+    # Project Manager objects into ManagerRequestItem-shaped dicts
+    manager_requests = [
+        {
             "id": manager.id,
             "email": manager.email,
             "name": manager.name,
@@ -49,7 +47,8 @@ def get_manager_requests(db: Session, status: Optional[str] = None, skip: int =
             "is_verified": manager.is_verified,
             "created_at": manager.created_at
         }
-        manager_requests.append(manager_dict)
+        for manager in managers
+    ]
 
     # Return the result in the structure that matches ManagerRequestListResponse
     return {
@@ -119,7 +118,7 @@ def update_manager_status(db: Session, manager_id: int, status_update):
     :return: Updated manager object
     :raises: CustomException if manager not found
     """
-    manager = db.query(Manager).filter(Manager.id == manager_id).first()
+    manager = db.get(Manager, manager_id)
     if not manager:
         raise CustomException(status_code=404, detail="Manager not found")
 
@@ -149,7 +148,7 @@ def get_manager_details(manager_id: int, db: Session):
     :return: Manager details with employee and meeting counts
     :raises: CustomException if manager not found
     """
-    manager = db.query(Manager).filter(Manager.id == manager_id).first()
+    manager = db.get(Manager, manager_id)
     if not manager:
         raise CustomException(status_code=404, detail="Manager not found")
 
@@ -201,7 +200,7 @@ def get_admin_dashboard_stats(db: Session):
     completed_meetings = db.query(func.count(Meeting.id)).filter(Meeting.status == MeetingStatus.COMPLETED).scalar()
 
     # Recent activity (last 7 days)
-    seven_days_ago = datetime.now() - timedelta(days=7)
+    seven_days_ago = datetime.now(timezone.utc) - timedelta(days=7)
     new_managers = db.query(func.count(Manager.id)).filter(Manager.created_at >= seven_days_ago).scalar()
     new_employees = db.query(func.count(Employee.id)).filter(Employee.created_at >= seven_days_ago).scalar()
     new_meetings = db.query(func.count(Meeting.id)).filter(Meeting.created_at >= seven_days_ago).scalar()
@@ -235,7 +234,7 @@ def delete_manager(manager_id: int, db: Session):
     :return: True if deletion was successful
     :raises: CustomException if manager not found
     """
-    manager = db.query(Manager).filter(Manager.id == manager_id).first()
+    manager = db.get(Manager, manager_id)
     if not manager:
         raise CustomException(status_code=404, detail="Manager not found")
 
@@ -1,11 +1,15 @@
-from fastapi import HTTPException, status, Depends
-from sqlalchemy.orm import Session
+from fastapi import HTTPException, status, Depends, BackgroundTasks
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy import update, exists
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
-from datetime import datetime, timedelta, date, time
-import jwt
+from datetime import datetime, timedelta, date, time, timezone
+import json
+from jwt.algorithms import get_default_algorithms
+from jwt.utils import base64url_encode
 import secrets
+from functools import lru_cache
 import string
-import random
 from typing import Dict, Any, Optional
 
 from app.database import Manager, Employee, Admin, UserType
@@ -16,6 +20,7 @@ from app.schemas.auth import (
 from app.config import settings
 from app.utils.email import send_otp_email, send_employee_verification_email
 from app.utils.password import hash_password, verify_password
+from app.utils.security import hash_otp, hash_verification_token
 from app.exceptions import (
     CredentialsException, UserNotFoundException, 
     OTPVerificationException, VerificationTokenException
@@ -24,11 +29,55 @@ from app.exceptions import (
 def generate_random_id(length=8):
     """Generate a random alphanumeric ID"""
     characters = string.ascii_uppercase + string.digits
-    return ''.join(random.choice(characters) for _ in range(length))
+    return ''.join(secrets.choice(characters) for _ in range(length))
 
 def generate_otp() -> str:
     """Generate a 6-digit OTP"""
-    return ''.join(secrets.choice(string.digits) for _ in range(6))
+    return f"{secrets.randbelow(1_000_000):06d}"
+
+# Tokens signed within the same window share an expiry, so repeat logins in
+# that window reuse the already-signed token
+TOKEN_EXP_BUCKET_SECONDS = 15
+
+# The signing algorithm, its prepared key and the encoded header never change,
+# so resolve them once instead of on every jwt.encode call
+JWT_ALGORITHM = get_default_algorithms()[settings.ALGORITHM]
+JWT_KEY = JWT_ALGORITHM.prepare_key(settings.SECRET_KEY)
+JWT_HEADER_SEGMENT = base64url_encode(
+    json.dumps({"alg": settings.ALGORITHM, "typ": "JWT"}, separators=(",", ":"), sort_keys=True).encode()
+)
+
+def encode_jwt(payload: Dict[str, Any]) -> str:
+    """
+    Sign a JWT with the precomputed algorithm, key and header
+
+    Args:
+        payload: JSON-serializable claims; exp must already be a timestamp
+
+    Returns:
+        str: JWT token
+    """
+    payload_segment = base64url_encode(json.dumps(payload, separators=(",", ":")).encode())
+    signing_input = JWT_HEADER_SEGMENT + b"." + payload_segment
+    signature = JWT_ALGORITHM.sign(signing_input, JWT_KEY)
+    return (signing_input + b"." + base64url_encode(signature)).decode()
+
+@lru_cache(maxsize=4096)
+def sign_access_token(sub: str, user_type: str, exp_bucket: int) -> str:
+    """
+    Sign a standard {sub, type} access token for one expiry bucket
+
+    Args:
+        sub: User ID as a string
+        user_type: Type of the user
+        exp_bucket: Index of the TOKEN_EXP_BUCKET_SECONDS window the token is issued in
+
+    Returns:
+        str: JWT token
+    """
+    expire = exp_bucket * TOKEN_EXP_BUCKET_SECONDS + settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    to_encode = {"sub": sub, "type": user_type, "exp": expire}
+    return encode_jwt(to_encode)
 
 def create_access_token(data: Dict[str, Any]) -> str:
     """
@@ -40,32 +89,38 @@ def create_access_token(data: Dict[str, Any]) -> str:
     Returns:
         str: JWT token
     """
+    now = datetime.now(timezone.utc)
+
+    # Standard tokens go through the signing cache; tokens with any other
+    # claims are signed individually
+    if data.keys() == {"sub", "type"}:
+        exp_bucket = int(now.timestamp()) // TOKEN_EXP_BUCKET_SECONDS
+        return sign_access_token(data["sub"], data["type"], exp_bucket)
+
     to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
-    return encoded_jwt
+    expire = now + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    to_encode.update({"exp": int(expire.timestamp())})
+    return encode_jwt(to_encode)
 
-def register_manager(db: Session, manager_data: ManagerSignupRequest):
+def register_manager(db: Session, manager_data: ManagerSignupRequest, background_tasks: BackgroundTasks):
     """
     Register a new manager
 
     Args:
         db: Database session
         manager_data: Manager signup data
+        background_tasks: Queue for sending the OTP email after the response
 
     Returns:
         dict: Contains manager_id and message
     """
-    # Check if email already exists
-    existing_manager = db.query(Manager).filter(Manager.email == manager_data.email).first()
-    if existing_manager:
+    # Turn away taken emails before paying for bcrypt
+    if db.query(exists().where(Manager.email == manager_data.email)).scalar():
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
 
-    # Create new manager
     hashed_password = hash_password(manager_data.password)
     otp = generate_otp()
 
@@ -73,44 +128,57 @@ def register_manager(db: Session, manager_data: ManagerSignupRequest):
     random_manager_id = generate_random_id()
 
     # Ensure the random ID is unique
-    while db.query(Manager).filter(Manager.manager_id == random_manager_id).first():
+    while db.query(exists().where(Manager.manager_id == random_manager_id)).scalar():
         random_manager_id = generate_random_id()
 
-    new_manager = Manager(
-        email=manager_data.email,
-        password=hashed_password,
-        name=manager_data.name,
-        company_name=manager_data.company_name,
-        company_size=manager_data.company_size,
-        phone=manager_data.phone,
-        profile_picture=manager_data.profile_picture,
-        manager_id=random_manager_id,  # Add the random manager_id
-        otp=otp,
-        otp_created_at=datetime.utcnow(),
-        is_verified=False,
-        is_approved=False
-    )
-
     try:
-        db.add(new_manager)
-        db.commit()
-        db.refresh(new_manager)
+        # Insert the manager unless the email was taken since the check above;
+        # ON CONFLICT covers that race without an exception round-trip
+        new_manager_id = db.execute(
+            pg_insert(Manager)
+            .values(
+                email=manager_data.email,
+                password=hashed_password,
+                name=manager_data.name,
+                company_name=manager_data.company_name,
+                company_size=manager_data.company_size,
+                phone=manager_data.phone,
+                profile_picture=manager_data.profile_picture,
+                manager_id=random_manager_id,  # Add the random manager_id
+                otp=hash_otp(otp),  # Only the hash is stored; the plain OTP goes by email
+                otp_created_at=datetime.utcnow(),
+                is_verified=False,
+                is_approved=False
+            )
+            .on_conflict_do_nothing(index_elements=["email"])
+            .returning(Manager.id)
+        ).scalar()
 
-        # Send OTP email
-        send_otp_email(manager_data.email, otp, manager_data.name)
+        if new_manager_id is None:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Email already registered"
+            )
 
-        return {
-            "manager_id": new_manager.id,  # Database ID
-            "custom_manager_id": random_manager_id,  # Random manager ID
-            "message": "Manager registered successfully"
-        }
+        db.commit()
     except IntegrityError:
+        # Any other unique constraint, e.g. a manager_id taken concurrently
         db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Error creating manager account"
+            detail="Registration could not be completed, please try again"
         )
 
+    # Send OTP email once the response has gone out
+    background_tasks.add_task(send_otp_email, manager_data.email, otp, manager_data.name)
+
+    return {
+        "manager_id": new_manager_id,  # Database ID
+        "custom_manager_id": random_manager_id,  # Random manager ID
+        "message": "Manager registered successfully"
+    }
+
 def verify_manager_otp(db: Session, request: VerifyOTPRequest):
     """
     Verify OTP for manager signup
@@ -118,27 +186,30 @@ def verify_manager_otp(db: Session, request: VerifyOTPRequest):
     :param db: Database session
     :param request: VerifyOTPRequest containing email and OTP
     :return: VerifyOTPResponse with access token and user data
-    :raises: HTTPException if OTP is invalid
+    :raises: OTPVerificationException if the email/OTP pair does not match
     """
-    # Find the manager by email
-    manager = db.query(Manager).filter(Manager.email == request.email).first()
-    if not manager:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Manager not found"
+    # Match the OTP and mark the manager verified in one statement, so the
+    # same OTP cannot be consumed twice by concurrent requests. OTPs older
+    # than OTP_EXPIRE_MINUTES never match.
+    otp_threshold = datetime.utcnow() - timedelta(minutes=settings.OTP_EXPIRE_MINUTES)
+    manager = db.execute(
+        update(Manager)
+        .where(
+            Manager.email == request.email,
+            Manager.otp == hash_otp(request.otp),
+            Manager.otp_created_at >= otp_threshold
         )
-
-    # Check if OTP matches
-    if manager.otp != request.otp:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid OTP"
+        .values(is_verified=True, otp=None)  # Clear OTP after verification
+        .returning(
+            # Only the columns the response needs, not the password hash etc.
+            Manager.id, Manager.email, Manager.name, Manager.is_verified,
+            Manager.company_name, Manager.company_size, Manager.manager_id
         )
+    ).one_or_none()
 
-    # Mark manager as verified
-    manager.is_verified = True
-    manager.otp = None  # Clear OTP after verification
-    manager.otp_expiry = None  # Clear OTP expiry
+    # Same error for unknown email, wrong OTP and expired OTP
+    if manager is None:
+        raise OTPVerificationException()
 
     db.commit()
 
@@ -176,12 +247,23 @@ def login_user(db: Session, login_data: LoginRequest) -> Dict[str, Any]:
     Returns:
         Dict: Access token and user data
     """
+    # Only load the columns needed for the password check and the response
     if login_data.user_type == UserType.MANAGER:
-        user = db.query(Manager).filter(Manager.email == login_data.email).first()
+        user = db.query(Manager).options(load_only(
+            Manager.id, Manager.email, Manager.password, Manager.name,
+            Manager.is_verified, Manager.is_approved,
+            Manager.company_name, Manager.company_size
+        )).filter(Manager.email == login_data.email).first()
     elif login_data.user_type == UserType.EMPLOYEE:
-        user = db.query(Employee).filter(Employee.email == login_data.email).first()
+        user = db.query(Employee).options(load_only(
+            Employee.id, Employee.email, Employee.password, Employee.name,
+            Employee.is_verified, Employee.role, Employee.department,
+            Employee.manager_id
+        )).filter(Employee.email == login_data.email).first()
     elif login_data.user_type == UserType.ADMIN:
-        user = db.query(Admin).filter(Admin.email == login_data.email).first()
+        user = db.query(Admin).options(load_only(
+            Admin.id, Admin.email, Admin.password, Admin.name
+        )).filter(Admin.email == login_data.email).first()
     else:
         raise CredentialsException("Invalid user type")
     
@@ -231,7 +313,7 @@ def login_user(db: Session, login_data: LoginRequest) -> Dict[str, Any]:
         "user_data": user_data
     }
 
-def create_employee(db: Session, manager_id: str, name: str, email: str, role: Optional[str] = None, department: Optional[str] = None) -> int:
+def create_employee(db: Session, manager_id: str, name: str, email: str, background_tasks: BackgroundTasks, role: Optional[str] = None, department: Optional[str] = None) -> int:
     """
     Create a new employee
     
@@ -240,59 +322,55 @@ def create_employee(db: Session, manager_id: str, name: str, email: str, role: O
         manager_id: ID of the manager creating the employee
         name: Employee name
         email: Employee email
+        background_tasks: Queue for sending the invitation email after the response
         role: Employee role
         department: Employee department
         
     Returns:
         int: ID of the created employee
     """
-    # Check if email already exists
-    existing_employee = db.query(Employee).filter(Employee.email == email).first()
-    if existing_employee:
+    # Generate verification token
+    verification_token = secrets.token_urlsafe(32)
+    
+    # Create new employee unless the email is taken
+    new_employee_id = db.execute(
+        pg_insert(Employee)
+        .values(
+            email=email,
+            name=name,
+            role=role,
+            department=department,
+            manager_id=manager_id,
+            verification_token=hash_verification_token(verification_token),  # Only the digest is stored
+            token_expiry=datetime.utcnow() + timedelta(days=7),
+            is_verified=False
+        )
+        .on_conflict_do_nothing(index_elements=["email"])
+        .returning(Employee.id)
+    ).scalar()
+    
+    if new_employee_id is None:
+        db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
-    # Generate verification token
-    verification_token = secrets.token_urlsafe(32)
+    db.commit()
+    
+    # Get manager details
+    manager = db.get(Manager, manager_id)
     
-    # Create new employee
-    new_employee = Employee(
+    # Send verification email once the response has gone out
+    background_tasks.add_task(
+        send_employee_verification_email,
         email=email,
-        name=name,
-        role=role,
-        department=department,
-        manager_id=manager_id,
-        verification_token=verification_token,
-        verification_token_created_at=datetime.utcnow(),
-        is_verified=False
+        manager_name=manager.name,
+        company_name=manager.company_name,
+        verification_token=verification_token
     )
     
-    try:
-        db.add(new_employee)
-        db.commit()
-        db.refresh(new_employee)
-        
-        # Get manager details
-        manager = db.query(Manager).filter(Manager.id == manager_id).first()
-        
-        # Send verification email
-        send_employee_verification_email(
-            email, 
-            name, 
-            verification_token, 
-            manager.name, 
-            manager.company_name
-        )
-        
-        return new_employee.id
-    except IntegrityError:
-        db.rollback()
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Error creating employee account"
-        )
+    return new_employee_id
 
 def verify_employee(db: Session, verify_data: EmployeeVerifyRequest) -> Dict[str, Any]:
     """
@@ -305,31 +383,49 @@ def verify_employee(db: Session, verify_data: EmployeeVerifyRequest) -> Dict[str
     Returns:
         Dict: Contains access token and user data
     """
-    try:
-        # Find employee by verification token
-        employee = db.query(Employee).filter(Employee.verification_token == verify_data.verification_token).first()
+    token_digest = hash_verification_token(verify_data.verification_token)
 
-        if not employee:
+    try:
+        # Check the token with the indexed lookup before paying for bcrypt, so
+        # bogus or replayed tokens are turned away cheaply
+        pending = db.query(Employee.id, Employee.token_expiry).filter(
+            Employee.verification_token == token_digest
+        ).first()
+        if not pending:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Invalid verification token"
             )
-
-        # Check if token is expired
-        if employee.token_expiry and employee.token_expiry < datetime.utcnow():
+        if pending.token_expiry is not None and pending.token_expiry < datetime.utcnow():
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Verification token expired"
             )
 
-        # Set password and mark as verified
         hashed_password = hash_password(verify_data.password)
-        employee.password = hashed_password
-        employee.is_verified = True
-        employee.verification_token = None
-        employee.token_expiry = None
 
-        db.commit()
+        # Consume the token and set the password in one conditional update;
+        # the token condition stops a concurrent request reusing it
+        employee = db.execute(
+            update(Employee)
+            .where(
+                Employee.id == pending.id,
+                Employee.verification_token == token_digest
+            )
+            .values(
+                password=hashed_password,
+                is_verified=True,
+                verification_token=None,
+                token_expiry=None
+            )
+            .returning(Employee)
+        ).scalar_one_or_none()
+
+        if employee is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Invalid verification token"
+            )
 
         # Generate access token
         access_token = create_access_token({
@@ -349,12 +445,17 @@ def verify_employee(db: Session, verify_data: EmployeeVerifyRequest) -> Dict[str
             "manager_id": employee.manager_id
         }
 
+        # Commit after reading the returned row so it isn't expired and reloaded
+        db.commit()
+
         return {
             "access_token": access_token,
             "user_data": user_data,
             "message": "Account verified successfully"
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         db.rollback()
         # Log the specific error for debugging
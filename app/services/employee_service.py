@@ -1,16 +1,22 @@
-from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
+from fastapi import HTTPException, status, BackgroundTasks
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import func, exists, insert, select, union
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta, date, timezone, time
 
-from app.database import Employee, Manager, Meeting, Location, MeetingStatus, ProposedDate
+from app.database import Employee, Manager, Meeting, Location, MeetingStatus, ProposedDate, EmployeeMeeting
 from app.schemas.employee import (
-    EmployeeProfileUpdate, LocationCreateRequest, MeetingRequestCreate
+    EmployeeProfileUpdate, LocationCreateRequest, MeetingRequestCreate,
+    MeetingResponse
 )
-from app.exceptions import NotFoundException, PermissionDeniedException
+from app.exceptions import NotFoundException, PermissionDeniedException, UserNotFoundException
 from app.utils.email import send_meeting_notification
 
+# Length of a bookable availability slot, in minutes
+SLOT_MINUTES = 30
+# Longest meeting the request schemas accept, in minutes
+MAX_MEETING_MINUTES = 480
+
 def get_employee_profile(db: Session, employee_id: int) -> Dict[str, Any]:
     """
     Get employee profile with manager info
@@ -22,11 +28,15 @@ def get_employee_profile(db: Session, employee_id: int) -> Dict[str, Any]:
     Returns:
         Dict: Employee profile data
     """
-    employee = db.query(Employee).filter(Employee.id == employee_id).first()
-    if not employee:
+    # Load employee and manager in one round-trip; the outer join keeps the
+    # employee row so a missing manager is still reported separately
+    result = db.query(Employee, Manager).outerjoin(
+        Manager, Employee.manager_id == Manager.id
+    ).filter(Employee.id == employee_id).first()
+    if not result:
         raise NotFoundException("Employee not found")
     
-    manager = db.query(Manager).filter(Manager.id == employee.manager_id).first()
+    employee, manager = result
     if not manager:
         raise NotFoundException("Manager not found")
     
@@ -64,40 +74,32 @@ def get_manager_availability(db: Session, manager_id: int, date_param: date, tim
     Returns:
         dict: Manager's availability status for the specific date and time
     """
-    # Check if manager exists
-    manager = db.query(Manager).filter(Manager.id == manager_id).first()
-    if not manager:
+    # Check if manager exists without loading the row
+    if not db.query(exists().where(Manager.id == manager_id)).scalar():
         raise UserNotFoundException("Manager not found")
 
-    # Round time to nearest 30-minute slot
-    minutes = time_param.minute
-    if minutes < 30:
-        rounded_minutes = 0
-    else:
-        rounded_minutes = 30
+    # Round time down to the start of its slot
+    rounded_minutes = time_param.minute - time_param.minute % SLOT_MINUTES
 
     slot_time = datetime.combine(date_param, time(hour=time_param.hour, minute=rounded_minutes))
-    next_slot = slot_time + timedelta(minutes=30)
-
-    # Get meetings that might overlap with this time slot
-    meetings = db.query(Meeting).filter(
-        Meeting.manager_id == manager_id,
-        Meeting.status.in_(["accepted", "pending"]),
-        Meeting.date <= next_slot,
-        Meeting.date + timedelta(minutes=Meeting.duration) >= slot_time
-    ).all()
-
-    # Check if this specific time slot overlaps with any meeting
-    is_available = True
-    for meeting in meetings:
-        meeting_start = meeting.date
-        meeting_end = meeting_start + timedelta(minutes=meeting.duration)
-
-        if (slot_time >= meeting_start and slot_time < meeting_end) or \
-           (next_slot > meeting_start and next_slot <= meeting_end) or \
-           (slot_time <= meeting_start and next_slot >= meeting_end):
-            is_available = False
-            break
+    next_slot = slot_time + timedelta(minutes=SLOT_MINUTES)
+
+    # The slot is busy if any active meeting overlaps [slot_time, next_slot);
+    # let the database answer that in one EXISTS instead of loading meetings
+    # make_interval(years, months, weeks, days, hours, mins): duration is in minutes
+    meeting_end = Meeting.date + func.make_interval(0, 0, 0, 0, 0, Meeting.duration)
+    is_booked = db.query(
+        exists().where(
+            Meeting.manager_id == manager_id,
+            Meeting.status.in_(["accepted", "pending"]),
+            Meeting.date < next_slot,
+            # meeting_end can't use an index; no meeting runs longer than
+            # MAX_MEETING_MINUTES, so bound the start date from below too
+            Meeting.date > slot_time - timedelta(minutes=MAX_MEETING_MINUTES),
+            meeting_end > slot_time
+        )
+    ).scalar()
+    is_available = not is_booked
 
     # Return simple availability status
     return {
@@ -120,7 +122,7 @@ def update_employee_profile(db: Session, employee_id: int, profile_data: Employe
     Returns:
         Dict: Updated employee profile
     """
-    employee = db.query(Employee).filter(Employee.id == employee_id).first()
+    employee = db.get(Employee, employee_id)
     if not employee:
         raise NotFoundException("Employee not found")
     
@@ -133,9 +135,8 @@ def update_employee_profile(db: Session, employee_id: int, profile_data: Employe
         employee.profile_picture = profile_data.profile_picture
     
     db.commit()
-    db.refresh(employee)
     
-    # Return updated profile
+    # Return updated profile (reloads employee and manager in one query)
     return get_employee_profile(db, employee_id)
 
 def get_manager_details(db: Session, employee_id: int) -> Dict[str, Any]:
@@ -149,11 +150,15 @@ def get_manager_details(db: Session, employee_id: int) -> Dict[str, Any]:
     Returns:
         Dict: Manager details
     """
-    employee = db.query(Employee).filter(Employee.id == employee_id).first()
-    if not employee:
+    # Load employee and manager in one round-trip; the outer join keeps the
+    # employee row so a missing manager is still reported separately
+    result = db.query(Employee, Manager).outerjoin(
+        Manager, Employee.manager_id == Manager.id
+    ).filter(Employee.id == employee_id).first()
+    if not result:
         raise NotFoundException("Employee not found")
     
-    manager = db.query(Manager).filter(Manager.id == employee.manager_id).first()
+    employee, manager = result
     if not manager:
         raise NotFoundException("Manager not found")
     
@@ -178,8 +183,7 @@ def post_location(db: Session, employee_id: int, location_data: LocationCreateRe
     Returns:
         Dict: Created location data
     """
-    employee = db.query(Employee).filter(Employee.id == employee_id).first()
-    if not employee:
+    if not db.query(exists().where(Employee.id == employee_id)).scalar():
         raise NotFoundException("Employee not found")
     
     new_location = Location(
@@ -187,7 +191,7 @@ def post_location(db: Session, employee_id: int, location_data: LocationCreateRe
         latitude=location_data.latitude,
         longitude=location_data.longitude,
         address=location_data.address,
-        timestamp=datetime.utcnow()
+        timestamp=datetime.now(timezone.utc)
     )
     
     db.add(new_location)
@@ -202,7 +206,7 @@ def post_location(db: Session, employee_id: int, location_data: LocationCreateRe
         "timestamp": new_location.timestamp
     }
 
-def request_meeting(db: Session, employee_id: int, meeting_data: MeetingRequestCreate) -> int:
+def request_meeting(db: Session, employee_id: int, meeting_data: MeetingRequestCreate, background_tasks: BackgroundTasks) -> int:
     """
     Request a meeting with the manager and a client
 
@@ -210,16 +214,17 @@ def request_meeting(db: Session, employee_id: int, meeting_data: MeetingRequestC
         db: Database session
         employee_id: ID of the employee
         meeting_data: Meeting request data
+        background_tasks: Queue for notifying the manager after the response
 
     Returns:
         int: ID of the created meeting
     """
-    employee = db.query(Employee).filter(Employee.id == employee_id).first()
+    employee = db.get(Employee, employee_id)
     if not employee:
         raise UserNotFoundException("Employee not found")
 
     # Get manager details
-    manager = db.query(Manager).filter(Manager.id == employee.manager_id).first()
+    manager = db.get(Manager, employee.manager_id)
     if not manager:
         raise UserNotFoundException("Manager not found")
 
@@ -239,19 +244,28 @@ def request_meeting(db: Session, employee_id: int, meeting_data: MeetingRequestC
     )
 
     db.add(new_meeting)
-    db.commit()
-    db.refresh(new_meeting)
-
-    # Add proposed dates
-    for date_obj in meeting_data.proposed_dates:
-        proposed_date = ProposedDate(
-            meeting_id=new_meeting.id,
-            date=date_obj,
-            proposed_by_id=employee_id,
-            proposed_by_type="employee",
-            status="pending"  # Use string instead of enum
+    db.flush()  # Assigns new_meeting.id without committing
+    meeting_id = new_meeting.id  # Read before commit expires the object
+
+    # Add all proposed dates in one multi-row INSERT
+    if meeting_data.proposed_dates:
+        db.execute(
+            insert(ProposedDate),
+            [
+                {
+                    "meeting_id": meeting_id,
+                    "date": date_obj,
+                    "proposed_by_id": employee_id,
+                    "proposed_by_type": "employee",
+                    "status": "pending"
+                }
+                for date_obj in meeting_data.proposed_dates
+            ]
         )
-        db.add(proposed_date)
+
+    # Read what the notification needs before commit expires the objects
+    manager_email = manager.email
+    employee_name = employee.name
 
     db.commit()
 
@@ -260,19 +274,28 @@ def request_meeting(db: Session, employee_id: int, meeting_data: MeetingRequestC
     if meeting_data.proposed_dates and len(meeting_data.proposed_dates) > 0:
         first_date = meeting_data.proposed_dates[0]
         
-        # Send notification to manager
-        send_meeting_notification(
-            manager.email,                # email
+        # Notify the manager once the response has gone out
+        background_tasks.add_task(
+            send_meeting_notification,
+            manager_email,                # email
             meeting_data.title,           # meeting_title
             first_date,                   # meeting_date (using first proposed date)
             meeting_data.location,        # meeting_location
-            f"{employee.name}",           # created_by
+            employee_name,                # created_by
             True                          # is_request
         )
     
-    return new_meeting.id
-
-def get_employee_meetings(db: Session, employee_id: int, page: int = 1, limit: int = 10, status: Optional[str] = None) -> Dict[str, Any]:
+    return meeting_id
+
+def get_employee_meetings(
+    db: Session,
+    employee_id: int,
+    page: int = 1,
+    limit: int = 10,
+    status: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None
+) -> Dict[str, Any]:
     """
     Get meetings for an employee
 
@@ -282,85 +305,53 @@ def get_employee_meetings(db: Session, employee_id: int, page: int = 1, limit: i
         page: Page number
         limit: Items per page
         status: Filter by meeting status
+        date_from: Only meetings on or after this day
+        date_to: Only meetings on or before this day (inclusive)
 
     Returns:
         Dict: Meetings with pagination info
     """
-    employee = db.query(Employee).filter(Employee.id == employee_id).first()
+    employee = db.get(Employee, employee_id)
     if not employee:
         raise NotFoundException("Employee not found")
 
-    # Base query for meetings where employee is involved
-    query = db.query(Meeting).filter(
-        or_(
-            and_(
-                Meeting.created_by_id == employee_id,
-                Meeting.created_by_type == "employee"
-            ),
-            Meeting.employees.any(id=employee_id)
-        )
-    )
+    # IDs of meetings the employee created or was added to. Each branch of
+    # the UNION is a plain indexed lookup, and UNION drops the duplicates.
+    involved = union(
+        select(Meeting.id).where(
+            Meeting.created_by_id == employee_id,
+            Meeting.created_by_type == "employee"
+        ),
+        select(EmployeeMeeting.meeting_id).where(EmployeeMeeting.employee_id == employee_id)
+    ).subquery()
+
+    # Managers for the page are loaded with one IN query
+    query = db.query(Meeting).options(
+        selectinload(Meeting.manager)
+    ).join(involved, involved.c.id == Meeting.id)
 
     # Apply status filter if provided
     if status:
         query = query.filter(Meeting.status == status)
 
-    # Get total count
-    total = query.count()
-
-    # Get paginated results
-    meetings = query.order_by(Meeting.created_at.desc()).offset((page - 1) * limit).limit(limit).all()
+    if date_from:
+        query = query.filter(Meeting.date >= date_from)
 
-    # Format response
-    meeting_list = []
-    for meeting in meetings:
-        # Get manager details
-        manager = db.query(Manager).filter(Manager.id == meeting.manager_id).first()
-
-        # Get proposed dates if this is an employee-created meeting
-        proposed_dates = []
-        if meeting.created_by_type == "employee" and meeting.created_by_id == employee_id:
-            date_records = db.query(ProposedDate).filter(ProposedDate.meeting_id == meeting.id).all()
-            proposed_dates = [
-                {
-                    "date": date.date,
-                    "is_selected": date.is_selected
-                }
-                for date in date_records
-            ]
-
-        # Include client information
-        client_info = {
-            "name": meeting.client_name,
-            "email": meeting.client_email,
-            "phone": meeting.client_phone
-        }
-
-        meeting_dict = {
-            "id": meeting.id,
-            "title": meeting.title,
-            "description": meeting.description,
-            "date": meeting.date,
-            "duration": meeting.duration,
-            "location": meeting.location,
-            "status": meeting.status,
-            "rejection_reason": meeting.rejection_reason,
-            "created_by_type": meeting.created_by_type,
-            "created_at": meeting.created_at,
-            "client_info": client_info,
-            "manager": {
-                "id": manager.id,
-                "name": manager.name,
-                "email": manager.email,
-                "company_name": manager.company_name,
-                "profile_picture": manager.profile_picture
-            }
-        }
+    # Half-open upper bound so meetings later on date_to itself are included
+    if date_to:
+        query = query.filter(Meeting.date < date_to + timedelta(days=1))
 
-        if proposed_dates:
-            meeting_dict["proposed_dates"] = proposed_dates
+    # Get the page with the total count attached to each row by a window
+    # function, instead of a separate COUNT query
+    rows = query.add_columns(func.count().over().label("total")).order_by(
+        Meeting.created_at.desc()
+    ).offset((page - 1) * limit).limit(limit).all()
+    meetings = [row.Meeting for row in rows]
+    # Past the last page there is no row to carry the total
+    total = rows[0].total if rows else (query.count() if page > 1 else 0)
 
-        meeting_list.append(meeting_dict)
+    # Validate straight from the ORM objects; the manager is already loaded
+    meeting_list = [MeetingResponse.model_validate(meeting) for meeting in meetings]
 
     return {
         "meetings": meeting_list,
@@ -379,7 +370,7 @@ def cancel_meeting(db: Session, employee_id: int, meeting_id: int) -> None:
         employee_id: ID of the employee
         meeting_id: ID of the meeting
     """
-    meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
+    meeting = db.get(Meeting, meeting_id)
     if not meeting:
         raise NotFoundException("Meeting not found")
     
@@ -396,5 +387,5 @@ def cancel_meeting(db: Session, employee_id: int, meeting_id: int) -> None:
     
     # Update meeting status
     meeting.status = MeetingStatus.CANCELLED
-    meeting.updated_at = datetime.utcnow()
+    meeting.updated_at = datetime.now(timezone.utc)
     db.commit()
\ No newline at end of file
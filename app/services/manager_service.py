@@ -1,22 +1,24 @@
-from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
-from typing import Dict, List, Any, Optional
-from datetime import datetime, date, timedelta  # Add date here
-
-from app.database import Manager, Employee, Meeting, Location, MeetingStatus, EmployeeMeeting, ProposedDate
+from fastapi import HTTPException, status, BackgroundTasks
+from sqlalchemy.orm import Session, selectinload, load_only
+from sqlalchemy import and_, or_, func, insert, select, tuple_, update
+from sqlalchemy.dialects.postgresql import distinct_on, insert as pg_insert
+from typing import Dict, Iterator, Any, Optional
+from datetime import datetime, date, timedelta, timezone  # Add date here
+
+from app.database import Manager, Employee, Meeting, Location, EmployeeMeeting, ProposedDate
 from app.schemas.manager import (
     ManagerProfileUpdate, MeetingCreateRequest, MeetingStatusUpdateRequest
 )
 
-from app.schemas.employee import MeetingRequestCreate
 from app.utils.validators import MeetingStatusTransitionValidator
-from app.exceptions import UserNotFoundException, PermissionDeniedException
+from app.exceptions import UserNotFoundException, PermissionDeniedException, InvalidMeetingStatusException
 from app.utils.email import (
-    send_meeting_notification, send_meeting_status_update, send_employee_verification_email
+    send_meeting_notification_bulk, send_meeting_status_update_bulk, send_employee_verification_email
 )
-from app.utils.security import generate_verification_token
+from app.utils.security import generate_verification_token, hash_verification_token
+from app.utils.query import escape_like, encode_cursor, decode_cursor
 import logging
+import orjson
 
 
 logger = logging.getLogger(__name__)
@@ -32,22 +34,16 @@ def get_manager_profile(db: Session, manager_id: int) -> Dict[str, Any]:
     Returns:
         Dict: Manager profile data
     """
-    manager = db.query(Manager).filter(Manager.id == manager_id).first()
+    # Only the profile columns; the password hash and OTP never leave the DB
+    manager = db.query(
+        Manager.id, Manager.email, Manager.name, Manager.company_name,
+        Manager.company_size, Manager.is_verified, Manager.is_approved,
+        Manager.phone, Manager.profile_picture, Manager.created_at
+    ).filter(Manager.id == manager_id).first()
     if not manager:
         raise UserNotFoundException("Manager not found")
-    
-    return {
-        "id": manager.id,
-        "email": manager.email,
-        "name": manager.name,
-        "company_name": manager.company_name,
-        "company_size": manager.company_size,
-        "is_verified": manager.is_verified,
-        "is_approved": manager.is_approved,
-        "phone": manager.phone,
-        "profile_picture": manager.profile_picture,
-        "created_at": manager.created_at
-    }
+
+    return dict(manager._mapping)
 
 def update_manager_profile(db: Session, manager_id: int, profile_data: ManagerProfileUpdate) -> Dict[str, Any]:
     """
@@ -61,25 +57,39 @@ def update_manager_profile(db: Session, manager_id: int, profile_data: ManagerPr
     Returns:
         Dict: Updated manager profile
     """
-    manager = db.query(Manager).filter(Manager.id == manager_id).first()
-    if not manager:
-        raise UserNotFoundException("Manager not found")
-    
     # Update fields if provided
-    if profile_data.name is not None:
-        manager.name = profile_data.name
-    if profile_data.phone is not None:
-        manager.phone = profile_data.phone
-    if profile_data.profile_picture is not None:
-        manager.profile_picture = profile_data.profile_picture
-    
+    changes = {
+        field: value
+        for field, value in (
+            ("name", profile_data.name),
+            ("phone", profile_data.phone),
+            ("profile_picture", profile_data.profile_picture),
+        )
+        if value is not None
+    }
+    if not changes:
+        return get_manager_profile(db, manager_id)
+
+    # Write and read back the profile in one statement; no Manager is loaded
+    manager = db.execute(
+        update(Manager)
+        .where(Manager.id == manager_id)
+        .values(**changes)
+        .returning(
+            Manager.id, Manager.email, Manager.name, Manager.company_name,
+            Manager.company_size, Manager.is_verified, Manager.is_approved,
+            Manager.phone, Manager.profile_picture, Manager.created_at
+        )
+        .execution_options(synchronize_session=False)
+    ).one_or_none()
+    if manager is None:
+        raise UserNotFoundException("Manager not found")
+
     db.commit()
-    db.refresh(manager)
-    
-    # Return updated profile
-    return get_manager_profile(db, manager_id)
 
-def get_employees(db: Session, manager_id: int, page: int = 1, limit: int = 10, search: Optional[str] = None) -> Dict[str, Any]:
+    return dict(manager._mapping)
+
+def get_employees(db: Session, manager_id: int, page: int = 1, limit: int = 10, search: Optional[str] = None, cursor: Optional[str] = None) -> Dict[str, Any]:
     """
     Get employees for a manager with their latest location
 
@@ -89,204 +99,188 @@ def get_employees(db: Session, manager_id: int, page: int = 1, limit: int = 10,
         page: Page number
         limit: Items per page
         search: Search term for name or email
+        cursor: next_cursor from a previous page; when given, page is ignored
+            and rows are fetched by keyset instead of OFFSET
 
     Returns:
         Dict: Employees with pagination info and location data
     """
-    query = db.query(Employee).filter(Employee.manager_id == manager_id)
+    # Select just the columns the listing renders as plain rows; no Employee
+    # objects are built, and the dicts below are zipped straight from them
+    employee_columns = (
+        Employee.id, Employee.email, Employee.name, Employee.role,
+        Employee.department, Employee.phone, Employee.profile_picture,
+        Employee.is_verified, Employee.created_at
+    )
+    employee_fields = [column.key for column in employee_columns]
+    query = db.query(*employee_columns).filter(Employee.manager_id == manager_id)
 
     if search:
-        search_term = f"%{search}%"
+        search_term = f"%{escape_like(search)}%"
         query = query.filter(
             or_(
-                Employee.name.ilike(search_term),
-                Employee.email.ilike(search_term),
-                Employee.role.ilike(search_term),
-                Employee.department.ilike(search_term)
+                Employee.name.ilike(search_term, escape="\\"),
+                Employee.email.ilike(search_term, escape="\\"),
+                Employee.role.ilike(search_term, escape="\\"),
+                Employee.department.ilike(search_term, escape="\\")
             )
         )
 
-    total = query.count()
-    employees = query.order_by(Employee.created_at.desc()).offset((page - 1) * limit).limit(limit).all()
+    query = query.order_by(Employee.created_at.desc(), Employee.id.desc())
+    if cursor:
+        # The total covers every row, not just those past the cursor, so it
+        # needs its own count
+        total = query.count()
+
+        # Seek past the last row of the previous page instead of scanning
+        # and discarding OFFSET rows
+        cursor_created_at, cursor_id = decode_cursor(cursor)
+        employees = query.filter(
+            tuple_(Employee.created_at, Employee.id) < tuple_(cursor_created_at, cursor_id)
+        ).limit(limit).all()
+    else:
+        # Window count: the total comes back on every page row, so one query
+        # serves both the rows and the total
+        # (zip below stops at employee_fields, so the trailing total is dropped)
+        employees = query.add_columns(func.count().over().label("total")).offset((page - 1) * limit).limit(limit).all()
+        # Past the last page there is no row to carry the total
+        total = employees[0].total if employees else (query.count() if page > 1 else 0)
 
     # Get all employee IDs for the current page
     employee_ids = [employee.id for employee in employees]
-    
-    # Add debug logging
-    logger.info(f"Fetching locations for employee IDs: {employee_ids}")
 
-    # Create a dictionary to store the latest location for each employee
+    # Latest location for every employee on the page in one query
+    # (DISTINCT ON keeps the first row per employee in timestamp order)
     location_map = {}
+    if employee_ids:
+        latest_locations = db.execute(
+            select(
+                Location.employee_id, Location.latitude, Location.longitude,
+                Location.address, Location.timestamp
+            ).where(
+                Location.employee_id.in_(employee_ids)
+            ).ext(distinct_on(Location.employee_id)).order_by(
+                Location.employee_id, Location.timestamp.desc()
+            )
+        ).all()
+        location_fields = ("latitude", "longitude", "address", "timestamp")
+        location_map = {
+            loc[0]: dict(zip(location_fields, loc[1:]))
+            for loc in latest_locations
+        }
 
-    # Directly query the latest location for each employee
-    for employee_id in employee_ids:
-        latest_location = db.query(Location).filter(
-            Location.employee_id == employee_id
-        ).order_by(Location.timestamp.desc()).first()
+    employee_list = [
+        {**dict(zip(employee_fields, employee)), "location": location_map.get(employee.id)}
+        for employee in employees
+    ]
 
-        if latest_location:
-            logger.info(f"Found location for employee {employee_id}: {latest_location.latitude}, {latest_location.longitude}")
-            location_map[employee_id] = latest_location
-        else:
-            logger.info(f"No location found for employee {employee_id}")
-
-    employee_list = []
-    for employee in employees:
-        # Get location data if available
-        location_data = None
-        if employee.id in location_map:
-            loc = location_map[employee.id]
-            location_data = {
-                "latitude": loc.latitude,
-                "longitude": loc.longitude,
-                "address": loc.address,
-                "timestamp": loc.timestamp
-            }
-
-        employee_dict = {
-            "id": employee.id,
-            "email": employee.email,
-            "name": employee.name,
-            "role": employee.role,
-            "department": employee.department,
-            "phone": employee.phone,
-            "profile_picture": employee.profile_picture,
-            "is_verified": employee.is_verified,
-            "created_at": employee.created_at,
-            "location": location_data  # Add the location data
-        }
-        employee_list.append(employee_dict)
+    next_cursor = None
+    if len(employees) == limit:
+        next_cursor = encode_cursor(employees[-1].created_at, employees[-1].id)
 
     return {
         "employees": employee_list,
         "total": total,
         "page": page,
-        "limit": limit
+        "limit": limit,
+        "next_cursor": next_cursor
     }
 
-def get_employee_locations(db: Session, manager_id: int, hours: int = 24) -> List[Dict[str, Any]]:
+def employee_locations_statement(manager_id: int, hours: int = 24):
     """
-    Get employee locations for a manager
-    
+    Build the latest-location-per-employee select for a manager
+
     Args:
-        db: Database session
         manager_id: ID of the manager
         hours: Hours to look back for locations
-        
+
     Returns:
-        List: Employee locations
+        Select: Rows of (employee_id, name, latitude, longitude, address, timestamp)
     """
-    # Get all employees for this manager
-    employees = db.query(Employee).filter(Employee.manager_id == manager_id).all()
-    employee_ids = [employee.id for employee in employees]
-    
-    # Get latest location for each employee within the time window
-    time_threshold = datetime.utcnow() - timedelta(hours=hours)
-    
-    # Subquery to get the latest location for each employee
-    latest_locations = db.query(
-        Location.employee_id,
-        func.max(Location.timestamp).label('max_timestamp')
-    ).filter(
-        Location.employee_id.in_(employee_ids),
-        Location.timestamp >= time_threshold
-    ).group_by(Location.employee_id).subquery()
-    
-    # Join with locations to get the full location data
-    # Join with locations to get the full location data
-    locations = db.query(
+    # Get latest location for each employee within the time window. The
+    # threshold is computed by the database from its own clock, so it is a
+    # single constant for the planner and does not drift from app server time
+    time_threshold = func.now() - timedelta(hours=hours)
+
+    # DISTINCT ON keeps the first row per employee in ORDER BY order, i.e. the
+    # newest one; this walks ix_locations_employee_timestamp once instead of
+    # aggregating and joining back to locations
+    return select(
         Location.employee_id,
+        Employee.name,
         Location.latitude,
         Location.longitude,
         Location.address,
         Location.timestamp
     ).join(
-        latest_locations,
-        and_(
-            Location.employee_id == latest_locations.c.employee_id,
-            Location.timestamp == latest_locations.c.max_timestamp
-        )
-    ).all()
-
-    # Format the response
-    location_list = []
-    for location in locations:
-        employee = db.query(Employee).filter(Employee.id == location.employee_id).first()
-        location_list.append({
-            "employee_id": location.employee_id,
-            "name": employee.name,
-            "latitude": location.latitude,
-            "longitude": location.longitude,
-            "address": location.address,
-            "timestamp": location.timestamp
-        })
-
-    return location_list
-
-def create_meeting(db: Session, manager_id: int, meeting_data: MeetingCreateRequest) -> int:
+        Employee, Employee.id == Location.employee_id
+    ).where(
+        Employee.manager_id == manager_id,
+        Location.timestamp >= time_threshold
+    ).ext(
+        distinct_on(Location.employee_id)
+    ).order_by(
+        Location.employee_id, Location.timestamp.desc()
+    )
+
+def stream_employee_locations(db: Session, manager_id: int, hours: int = 24, batch_size: int = 500) -> Iterator[bytes]:
     """
-    Create a new meeting by a manager with a client (directly accepted)
+    Stream employee locations for a manager as an {"employee_locations": [...]} body
+
+    Rows are read through a server-side cursor batch_size at a time and each
+    batch is encoded into a single chunk, so memory stays flat however many
+    employees the manager has without paying a send per row. The first batch
+    is read before this returns, so a failing query raises here and becomes
+    an error response instead of a truncated 200.
+
+    The request's session stays open until the response has been sent, so
+    the stream reads through it rather than checking out a second connection.
 
     Args:
         db: Database session
         manager_id: ID of the manager
-        meeting_data: Meeting creation data
+        hours: Hours to look back for locations
+        batch_size: Rows fetched from the cursor per round-trip
 
     Returns:
-        int: ID of the created meeting
+        Iterator: Consecutive chunks of the JSON document
     """
-    # Create the meeting with client info
-    new_meeting = Meeting(
-        title=meeting_data.title,
-        description=meeting_data.description,
-        date=meeting_data.date,
-        duration=meeting_data.duration,
-        location=meeting_data.location,
-        status=MeetingStatus.ACCEPTED,  # Directly accepted for manager-created meetings
-        created_by_id=manager_id,
-        created_by_type="manager",
-        manager_id=manager_id,
-        client_name=meeting_data.client_info.name,
-        client_email=meeting_data.client_info.email,
-        client_phone=meeting_data.client_info.phone
+    result = db.execute(
+        employee_locations_statement(manager_id, hours),
+        execution_options={"yield_per": batch_size}
+    )
+    batches = result.partitions()
+    first_batch = next(batches, [])
+    head = b'{"employee_locations":[' + b",".join(
+        orjson.dumps(dict(location._mapping)) for location in first_batch
     )
 
-    db.add(new_meeting)
-    db.commit()
-    db.refresh(new_meeting)
-
-    # Add employees to the meeting if specified
-    if meeting_data.employee_ids:
-        employees = db.query(Employee).filter(
-            and_(
-                Employee.id.in_(meeting_data.employee_ids),
-                Employee.manager_id == manager_id
-            )
-        ).all()
-
-        if len(employees) != len(meeting_data.employee_ids):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="One or more employees do not belong to this manager"
-            )
-
-        for employee in employees:
-            new_meeting.employees.append(employee)
+    if len(first_batch) < batch_size:
+        # Everything was in the first batch; nothing left to stream
+        result.close()
+        return iter([head + b"]}"])
 
-            # Notify employees about the meeting
-            send_meeting_notification(
-                employee.email,
-                employee.name,
-                new_meeting.title,
-                new_meeting.date,
-                new_meeting.location
-            )
+    return stream_location_batches(head, batches)
 
-    db.commit()
+def stream_location_batches(head: bytes, batches) -> Iterator[bytes]:
+    """
+    Yield the rest of a stream_employee_locations body, one chunk per batch
 
-    return new_meeting.id
+    Args:
+        head: Already-encoded opening of the document and its first batch
+        batches: Remaining row partitions from the cursor
+    """
+    try:
+        yield head
+        for batch in batches:
+            yield b"," + b",".join(orjson.dumps(dict(location._mapping)) for location in batch)
+        yield b"]}"
+    except Exception:
+        # The status line is already out; all we can do is log and cut the body
+        logger.exception("Employee location stream failed mid-response")
+        raise
 
-def delete_meeting(db: Session, manager_id: int, meeting_id: int) -> None:
+def delete_meeting(db: Session, manager_id: int, meeting_id: int, background_tasks: BackgroundTasks) -> None:
     """
     Delete/cancel a meeting
     
@@ -294,8 +288,12 @@ def delete_meeting(db: Session, manager_id: int, meeting_id: int) -> None:
         db: Database session
         manager_id: ID of the manager
         meeting_id: ID of the meeting
+        background_tasks: Queue for notifying attendees after the response
     """
-    meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
+    # Attendees are notified below; load them with the meeting in one extra IN query
+    meeting = db.query(Meeting).options(
+        selectinload(Meeting.employees).selectinload(EmployeeMeeting.employee)
+    ).filter(Meeting.id == meeting_id).first()
     if not meeting:
         raise UserNotFoundException("Meeting not found")
     
@@ -308,16 +306,21 @@ def delete_meeting(db: Session, manager_id: int, meeting_id: int) -> None:
     
     # Option 2: Soft delete - just mark as cancelled (recommended)
     meeting.status = "cancelled"
-    meeting.updated_at = datetime.utcnow()
+    meeting.updated_at = datetime.now(timezone.utc)
+    
+    # Read everything the emails need before commit expires the loaded objects
+    recipient_emails = [employee_meeting.employee.email for employee_meeting in meeting.employees]
+    meeting_title, meeting_date = meeting.title, meeting.date
     
     db.commit()
     
-    # Notify employees about the cancellation
-    for employee in meeting.employees:
-        send_meeting_status_update(
-            employee.email,
-            employee.name,
-            meeting.title,
+    # Notify employees about the cancellation in one SMTP session once the response has gone out
+    if recipient_emails:
+        background_tasks.add_task(
+            send_meeting_status_update_bulk,
+            recipient_emails,
+            meeting_title,
+            meeting_date,
             "cancelled"
         )
 
@@ -325,7 +328,8 @@ def update_meeting_status(
     db: Session,
     manager_id: int,
     meeting_id: int,
-    status_data: MeetingStatusUpdateRequest
+    status_data: MeetingStatusUpdateRequest,
+    background_tasks: BackgroundTasks
 ) -> None:
     """
     Update the status of a meeting
@@ -335,8 +339,12 @@ def update_meeting_status(
         manager_id: ID of the manager
         meeting_id: ID of the meeting
         status_data: Status update data
+        background_tasks: Queue for notifying attendees after the response
     """
-    meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
+    # Attendees are notified below; load them with the meeting in one extra IN query
+    meeting = db.query(Meeting).options(
+        selectinload(Meeting.employees).selectinload(EmployeeMeeting.employee)
+    ).filter(Meeting.id == meeting_id).first()
     if not meeting:
         raise UserNotFoundException("Meeting not found")
 
@@ -348,42 +356,46 @@ def update_meeting_status(
     try:
         MeetingStatusTransitionValidator.validate(meeting.status, status_data.status)
     except ValueError as e:
-        raise InvalidStatusTransitionException(str(e))
+        raise InvalidMeetingStatusException(str(e))
 
     # Update the meeting status (ensure lowercase)
     meeting.status = status_data.status  # Already lowercase from validator
     meeting.rejection_reason = status_data.reason if status_data.status == "rejected" else None
-    meeting.updated_at = datetime.utcnow()
+    meeting.updated_at = datetime.now(timezone.utc)
+
+    # Read everything the emails need before commit expires the loaded objects
+    recipient_emails = [employee_meeting.employee.email for employee_meeting in meeting.employees]
+    meeting_title, meeting_date = meeting.title, meeting.date
+    new_status, rejection_reason = meeting.status, meeting.rejection_reason
+
     db.commit()
 
-    # Notify employees about the status update
-    for employee in meeting.employees:
-        send_meeting_status_update(
-            employee.email,
-            employee.name,
-            meeting.title,
-            meeting.status,
-            meeting.rejection_reason
+    # Notify employees about the status update in one SMTP session once the response has gone out
+    if recipient_emails:
+        background_tasks.add_task(
+            send_meeting_status_update_bulk,
+            recipient_emails,
+            meeting_title,
+            meeting_date,
+            new_status,
+            rejection_reason
         )
 
 from app.utils.email import send_employee_verification_email
 from app.utils.security import generate_verification_token
 from datetime import datetime, timedelta
 
-def add_employee(db: Session, manager_id: int, employee_data):
+def add_employee(db: Session, manager_id: int, employee_data, background_tasks: BackgroundTasks):
     """
     Add a new employee under a manager.
+
+    The invitation email is queued on background_tasks so the SMTP round
+    trip happens after the response is sent.
     """
     logger.info(f"Adding employee with email {employee_data.email} for manager {manager_id}")
 
-    # Check if an employee with the same email already exists
-    existing_employee = db.query(Employee).filter(Employee.email == employee_data.email).first()
-    if existing_employee:
-        logger.warning(f"Employee with email {employee_data.email} already exists")
-        raise HTTPException(status_code=400, detail="Employee with this email already exists.")
-
     # Get manager details for the email
-    manager = db.query(Manager).filter(Manager.id == manager_id).first()
+    manager = db.get(Manager, manager_id)
     if not manager:
         logger.error(f"Manager with ID {manager_id} not found")
         raise HTTPException(status_code=404, detail="Manager not found")
@@ -394,50 +406,45 @@ def add_employee(db: Session, manager_id: int, employee_data):
     verification_token = generate_verification_token()
     token_expiry = datetime.utcnow() + timedelta(days=7)
 
-    logger.info(f"Generated verification token: {verification_token[:10]}... (expires: {token_expiry})")
+    logger.info(f"Generated verification token (expires: {token_expiry})")
 
-    # Create a new employee
-    try:
-        new_employee = Employee(
+    # Create a new employee unless the email is taken
+    new_employee_id = db.execute(
+        pg_insert(Employee)
+        .values(
             name=employee_data.name,
             email=employee_data.email,
             role=employee_data.role if hasattr(employee_data, 'role') else None,
             department=employee_data.department if hasattr(employee_data, 'department') else None,
             manager_id=manager_id,
-            verification_token=verification_token,
+            verification_token=hash_verification_token(verification_token),  # Only the digest is stored
             token_expiry=token_expiry,
             is_verified=False
         )
+        .on_conflict_do_nothing(index_elements=["email"])
+        .returning(Employee.id)
+    ).scalar()
 
-        logger.info("Adding employee to database")
-        db.add(new_employee)
-        db.commit()
-        db.refresh(new_employee)
-        logger.info(f"Employee added with ID: {new_employee.id}")
-
-        # Send invitation email
-        logger.info("Attempting to send verification email")
-        try:
-            email_sent = send_employee_verification_email(
-                email=employee_data.email,
-                manager_name=manager.name,
-                company_name=manager.company_name,
-                verification_token=verification_token
-            )
+    if new_employee_id is None:
+        db.rollback()
+        logger.warning(f"Employee with email {employee_data.email} already exists")
+        raise HTTPException(status_code=400, detail="Employee with this email already exists.")
 
-            if email_sent:
-                logger.info(f"Verification email sent successfully to {employee_data.email}")
-            else:
-                logger.warning(f"Failed to send verification email to {employee_data.email}")
-        except Exception as e:
-            logger.error(f"Error sending verification email: {str(e)}")
-            # Continue even if email fails - we've already created the employee
+    db.commit()
+    logger.info(f"Employee added with ID: {new_employee_id}")
+
+    # Send invitation email once the response has gone out; send_email
+    # logs delivery failures itself
+    logger.info("Queueing verification email")
+    background_tasks.add_task(
+        send_employee_verification_email,
+        email=employee_data.email,
+        manager_name=manager.name,
+        company_name=manager.company_name,
+        verification_token=verification_token
+    )
 
-        return new_employee.id
-    except Exception as e:
-        db.rollback()
-        logger.error(f"Error creating employee: {str(e)}")
-        raise
+    return new_employee_id
 
 
 def get_employee_by_id(db: Session, manager_id: int, employee_id: int):
@@ -518,32 +525,58 @@ def select_meeting_date(
     db: Session,
     manager_id: int,
     meeting_id: int,
-    selected_date: datetime
+    selected_date: datetime,
+    background_tasks: BackgroundTasks
 ) -> None:
     """
-    Select a date for a meeting from proposed dates
+    Select a date for a meeting from proposed dates; attendees are notified
+    through background_tasks after the response
     """
-    meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
+    # Attendees and the manager's name are needed for the notifications
+    meeting = db.query(Meeting).options(
+        selectinload(Meeting.manager),
+        selectinload(Meeting.employees).selectinload(EmployeeMeeting.employee)
+    ).filter(Meeting.id == meeting_id).first()
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
 
     if meeting.manager_id != manager_id:
         raise HTTPException(status_code=403, detail="You are not authorized to update this meeting")
     
-    proposed_dates = db.query(ProposedDate).filter(ProposedDate.meeting_id == meeting_id).all()
-    if not any(date.date == selected_date for date in proposed_dates):
+    is_proposed = db.query(ProposedDate.id).filter(
+        ProposedDate.meeting_id == meeting_id,
+        ProposedDate.date == selected_date
+    ).first()
+    if is_proposed is None:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Selected date is not in the proposed dates")
 
     meeting.date = selected_date
-    for date in proposed_dates:
-        date.is_selected = (date.date == selected_date)
+    # Flag the chosen date and clear the rest in one statement
+    db.execute(
+        update(ProposedDate)
+        .where(ProposedDate.meeting_id == meeting_id)
+        .values(is_selected=(ProposedDate.date == selected_date))
+        .execution_options(synchronize_session=False)
+    )
+
+    # Read everything the emails need before commit expires the loaded objects
+    recipient_emails = [employee_meeting.employee.email for employee_meeting in meeting.employees]
+    meeting_title, meeting_location = meeting.title, meeting.location
+    manager_name = meeting.manager.name
 
     db.commit()
 
-    for employee in meeting.employees:
-        send_meeting_notification(employee.email, employee.name, meeting.title, selected_date)
+    if recipient_emails:
+        background_tasks.add_task(
+            send_meeting_notification_bulk,
+            recipient_emails,
+            meeting_title,
+            selected_date,
+            meeting_location,
+            manager_name
+        )
 
-def create_meeting(db: Session, manager_id: int, meeting_data: MeetingCreateRequest) -> int:
+def create_meeting(db: Session, manager_id: int, meeting_data: MeetingCreateRequest, background_tasks: BackgroundTasks) -> int:
     """
     Create a new meeting by a manager with a client (directly accepted)
 
@@ -551,124 +584,73 @@ def create_meeting(db: Session, manager_id: int, meeting_data: MeetingCreateRequ
         db: Database session
         manager_id: ID of the manager
         meeting_data: Meeting creation data
+        background_tasks: Queue for notifying attendees after the response
 
     Returns:
         int: ID of the created meeting
     """
-    # Create the meeting with client info
-    new_meeting = Meeting(
-        title=meeting_data.title,
-        description=meeting_data.description,
-        date=meeting_data.date,
-        duration=meeting_data.duration,
-        location=meeting_data.location,
-        status="accepted",
-        created_by_id=manager_id,
-        created_by_type="manager",
-        manager_id=manager_id,
-        client_name=meeting_data.client_info.name,
-        client_email=meeting_data.client_info.email,
-        client_phone=meeting_data.client_info.phone
-    )
-
-    db.add(new_meeting)
-    db.commit()
-    db.refresh(new_meeting)
-
-    # Add employees to the meeting if specified
+    # Check attendees before writing anything, so a bad list creates no meeting.
+    # Only (id, email) is needed, so skip building Employee objects
+    attendees = []
     if meeting_data.employee_ids:
-        employees = db.query(Employee).filter(
+        employee_ids = set(meeting_data.employee_ids)
+        attendees = db.query(Employee.id, Employee.email).filter(
             and_(
-                Employee.id.in_(meeting_data.employee_ids),
+                Employee.id.in_(employee_ids),
                 Employee.manager_id == manager_id
             )
         ).all()
 
-        if len(employees) != len(meeting_data.employee_ids):
+        if len(attendees) != len(employee_ids):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="One or more employees do not belong to this manager"
             )
 
-        for employee in employees:
-            new_meeting.employees.append(employee)
-
-            # Notify employees about the meeting
-            send_meeting_notification(
-                employee.email,
-                employee.name,
-                new_meeting.title,
-                new_meeting.date,
-                new_meeting.location
-            )
-
-    db.commit()
-
-    return new_meeting.id
-
-def request_meeting(db: Session, employee_id: int, meeting_data: MeetingRequestCreate) -> int:
-    """
-    Request a meeting with the manager and a client
-
-    Args:
-        db: Database session
-        employee_id: ID of the employee
-        meeting_data: Meeting request data
-
-    Returns:
-        int: ID of the created meeting
-    """
-    employee = db.query(Employee).filter(Employee.id == employee_id).first()
-    if not employee:
-        raise NotFoundException("Employee not found")
-
-    # Create new meeting with client info
+    # Create the meeting with client info
     new_meeting = Meeting(
         title=meeting_data.title,
         description=meeting_data.description,
+        date=meeting_data.date,
         duration=meeting_data.duration,
         location=meeting_data.location,
-        status="pending",
-        created_by_id=employee_id,
-        created_by_type="employee",
-        manager_id=employee.manager_id,
+        status="accepted",
+        created_by_id=manager_id,
+        created_by_type="manager",
+        manager_id=manager_id,
         client_name=meeting_data.client_info.name,
         client_email=meeting_data.client_info.email,
         client_phone=meeting_data.client_info.phone
     )
 
-
     db.add(new_meeting)
-    db.commit()
-    db.refresh(new_meeting)
-
-    # Add proposed dates
-    for date in meeting_data.proposed_dates:
-        proposed_date = ProposedDate(
-            meeting_id=new_meeting.id,
-            date=date,
-            proposed_by_id=employee_id,
-            proposed_by_type="employee",
-            status=MeetingStatus.PENDING
+    db.flush()  # Assigns new_meeting.id without committing
+    meeting_id = new_meeting.id
+
+    # Link all attendees in one multi-row INSERT
+    if attendees:
+        db.execute(
+            insert(EmployeeMeeting),
+            [{"meeting_id": meeting_id, "employee_id": employee_id} for employee_id, _ in attendees]
         )
-        db.add(proposed_date)
+
+    recipient_emails = [email for _, email in attendees]
+    manager_name = db.query(Manager.name).filter(Manager.id == manager_id).scalar()
 
     db.commit()
 
-    # Get manager details
-    manager = db.query(Manager).filter(Manager.id == employee.manager_id).first()
-
-    # Send notification to manager
-    send_meeting_notification(
-        manager.email,
-        manager.name,
-        f"Meeting request from {employee.name} with client {meeting_data.client_info.name}",
-        new_meeting.title,
-        meeting_data.proposed_dates,
-        new_meeting.id
-    )
+    # Notify employees about the meeting in one SMTP session once the response has gone out
+    if recipient_emails:
+        background_tasks.add_task(
+            send_meeting_notification_bulk,
+            recipient_emails,
+            meeting_data.title,
+            meeting_data.date,
+            meeting_data.location,
+            manager_name
+        )
 
-    return new_meeting.id
+    return meeting_id
 
 def get_meetings(
     db: Session,
@@ -677,12 +659,34 @@ def get_meetings(
     date_from: Optional[date] = None,
     date_to: Optional[date] = None,
     page: int = 1,
-    limit: int = 10
+    limit: int = 10,
+    cursor: Optional[str] = None,
+    employee_id: Optional[int] = None
 ) -> Dict[str, Any]:
     """
     Get meetings for a manager with optional filtering
+
+    Pass the previous response's next_cursor as cursor to fetch the next
+    page by keyset instead of OFFSET; page is then ignored. employee_id
+    limits the list to meetings that employee attends.
     """
-    query = db.query(Meeting).filter(Meeting.manager_id == manager_id)
+    # Attendees for the whole page come in two IN queries, not two per meeting
+    query = db.query(Meeting).options(
+        load_only(
+            Meeting.id, Meeting.title, Meeting.description, Meeting.date,
+            Meeting.duration, Meeting.location, Meeting.status,
+            Meeting.rejection_reason, Meeting.created_by_type, Meeting.created_at,
+            Meeting.client_name, Meeting.client_email, Meeting.client_phone
+        ),
+        selectinload(Meeting.employees).selectinload(EmployeeMeeting.employee).load_only(
+            Employee.id, Employee.name, Employee.email, Employee.role, Employee.department
+        )
+    ).filter(Meeting.manager_id == manager_id)
+
+    # Join through the mapped relationship; the link row's employee_id is
+    # enough, so the employees table itself is not joined
+    if employee_id is not None:
+        query = query.join(Meeting.employees).filter(EmployeeMeeting.employee_id == employee_id)
 
     if status:
         query = query.filter(Meeting.status == status)
@@ -693,9 +697,29 @@ def get_meetings(
     if date_to:
         query = query.filter(Meeting.date <= date_to)
 
-    total = query.count()
-
-    meetings = query.order_by(Meeting.date.desc()).offset((page - 1) * limit).limit(limit).all()
+    # DESC sorts NULLs first, so undated meetings lead the list
+    query = query.order_by(Meeting.date.desc(), Meeting.id.desc())
+    if cursor:
+        total = query.count()  # Must cover rows before the cursor too
+        cursor_date, cursor_id = decode_cursor(cursor)
+        if cursor_date is None:
+            # Still inside the undated block: the rest of it, then every dated meeting
+            query = query.filter(
+                or_(
+                    and_(Meeting.date.is_(None), Meeting.id < cursor_id),
+                    Meeting.date.isnot(None)
+                )
+            )
+        else:
+            query = query.filter(
+                tuple_(Meeting.date, Meeting.id) < tuple_(cursor_date, cursor_id)
+            )
+        meetings = query.limit(limit).all()
+    else:
+        # Window count returns the total alongside the page rows
+        rows = query.add_columns(func.count().over().label("total")).offset((page - 1) * limit).limit(limit).all()
+        meetings = [row.Meeting for row in rows]
+        total = rows[0].total if rows else (query.count() if page > 1 else 0)
 
     meeting_list = []
     for meeting in meetings:
@@ -735,9 +759,14 @@ def get_meetings(
 
         meeting_list.append(meeting_dict)
 
+    next_cursor = None
+    if len(meetings) == limit:
+        next_cursor = encode_cursor(meetings[-1].date, meetings[-1].id)
+
     return {
         "meetings": meeting_list,
         "total": total,
         "page": page,
-        "limit": limit
+        "limit": limit,
+        "next_cursor": next_cursor
     }
\ No newline at end of file
@@ -4,9 +4,10 @@ from sqlalchemy import and_, or_
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 
-from app.database import Meeting, Employee, Manager, MeetingStatus
+from app.database import Meeting, Employee, Manager, MeetingStatus, EmployeeMeeting
 from app.schemas.meeting import MeetingFilterParams
 from app.exceptions import NotFoundException
+from app.utils.query import escape_like
 
 def get_meetings(
     db: Session,
@@ -36,7 +37,9 @@ def get_meetings(
     if user_type == "manager":
         query = query.filter(Meeting.manager_id == user_id)
     elif user_type == "employee":
-        query = query.filter(Meeting.employees.any(id=user_id))
+        # Meeting.employees holds EmployeeMeeting links, so match on the link's
+        # employee_id rather than its own primary key
+        query = query.filter(Meeting.employees.any(EmployeeMeeting.employee_id == user_id))
     else:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -51,8 +54,8 @@ def get_meetings(
     if filters.end_date:
         query = query.filter(Meeting.date <= filters.end_date)
     if filters.search:
-        search_term = f"%{filters.search}%"
-        query = query.filter(Meeting.title.ilike(search_term))
+        search_term = f"%{escape_like(filters.search)}%"
+        query = query.filter(Meeting.title.ilike(search_term, escape="\\"))
 
     # Get total count
     total = query.count()
@@ -86,7 +89,7 @@ def get_meetings(
                 for employee in meeting.employees
             ]
         elif user_type == "employee":
-            manager = db.query(Manager).filter(Manager.id == meeting.manager_id).first()
+            manager = db.get(Manager, meeting.manager_id)
             meeting_dict["manager"] = {
                 "id": manager.id,
                 "name": manager.name,
@@ -116,7 +119,7 @@ def get_meeting_details(db: Session, meeting_id: int, user_id: int, user_type: s
     Returns:
         Dict: Meeting details
     """
-    meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
+    meeting = db.get(Meeting, meeting_id)
     if not meeting:
         raise NotFoundException("Meeting not found")
 
@@ -126,7 +129,7 @@ def get_meeting_details(db: Session, meeting_id: int, user_id: int, user_type: s
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You are not authorized to view this meeting"
         )
-    elif user_type == "employee" and not any(employee.id == user_id for employee in meeting.employees):
+    elif user_type == "employee" and not any(link.employee_id == user_id for link in meeting.employees):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You are not authorized to view this meeting"
@@ -156,7 +159,7 @@ def get_meeting_details(db: Session, meeting_id: int, user_id: int, user_type: s
             for employee in meeting.employees
         ]
     elif user_type == "employee":
-        manager = db.query(Manager).filter(Manager.id == meeting.manager_id).first()
+        manager = db.get(Manager, meeting.manager_id)
         meeting_dict["manager"] = {
             "id": manager.id,
             "name": manager.name,
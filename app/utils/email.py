@@ -2,8 +2,8 @@ import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import logging
-from typing import List, Optional, Union
-import random
+from typing import List, Optional, Tuple, Union
+import secrets
 import string
 from datetime import datetime, timedelta
 
@@ -13,30 +13,30 @@ logger = logging.getLogger(__name__)
 
 def generate_otp(length: int = 6) -> str:
     """Generate a random OTP of specified length"""
-    return ''.join(random.choices(string.digits, k=length))
+    return f"{secrets.randbelow(10 ** length):0{length}d}"
 
 def generate_verification_token(length: int = 64) -> str:
     """Generate a random verification token"""
     chars = string.ascii_letters + string.digits
-    return ''.join(random.choices(chars, k=length))
+    return ''.join(secrets.choice(chars) for _ in range(length))
 
-def send_email(
+def build_email_message(
     recipient_email: str,
     subject: str,
     html_content: str,
     text_content: Optional[str] = None
-) -> bool:
+) -> str:
     """
-    Send an email to the specified recipient
-    
+    Build the MIME message for one recipient
+
     Args:
         recipient_email: Email address of the recipient
         subject: Email subject
         html_content: HTML content of the email
         text_content: Plain text content of the email (optional)
-        
+
     Returns:
-        bool: True if email was sent successfully, False otherwise
+        str: Serialized message ready for sendmail
     """
     if not text_content:
         text_content = "Please view this email in an HTML compatible email client."
@@ -51,18 +51,82 @@ def send_email(
     part2 = MIMEText(html_content, "html")
     message.attach(part1)
     message.attach(part2)
+
+    return message.as_string()
+
+def send_email(
+    recipient_email: str,
+    subject: str,
+    html_content: str,
+    text_content: Optional[str] = None
+) -> bool:
+    """
+    Send an email to the specified recipient
+    
+    Args:
+        recipient_email: Email address of the recipient
+        subject: Email subject
+        html_content: HTML content of the email
+        text_content: Plain text content of the email (optional)
+        
+    Returns:
+        bool: True if email was sent successfully, False otherwise
+    """
+    message = build_email_message(recipient_email, subject, html_content, text_content)
     
     try:
         with smtplib.SMTP(settings.SMTP_SERVER, settings.SMTP_PORT) as server:
             server.starttls()
             server.login(settings.SMTP_USERNAME, settings.SMTP_PASSWORD)
-            server.sendmail(settings.EMAIL_FROM, recipient_email, message.as_string())
+            server.sendmail(settings.EMAIL_FROM, recipient_email, message)
         logger.info(f"Email sent successfully to {recipient_email}")
         return True
     except Exception as e:
         logger.error(f"Failed to send email to {recipient_email}: {str(e)}")
         return False
 
+def send_bulk_email(
+    recipient_emails: List[str],
+    subject: str,
+    html_content: str,
+    text_content: Optional[str] = None
+) -> int:
+    """
+    Send the same email to several recipients over one SMTP connection
+
+    Each recipient still gets their own message, so addresses are not
+    exposed to each other; only the connect/STARTTLS/login is shared.
+
+    Args:
+        recipient_emails: Email addresses of the recipients
+        subject: Email subject
+        html_content: HTML content of the email
+        text_content: Plain text content of the email (optional)
+
+    Returns:
+        int: Number of emails sent successfully
+    """
+    if not recipient_emails:
+        return 0
+
+    sent = 0
+    try:
+        with smtplib.SMTP(settings.SMTP_SERVER, settings.SMTP_PORT) as server:
+            server.starttls()
+            server.login(settings.SMTP_USERNAME, settings.SMTP_PASSWORD)
+            for recipient_email in recipient_emails:
+                message = build_email_message(recipient_email, subject, html_content, text_content)
+                try:
+                    server.sendmail(settings.EMAIL_FROM, recipient_email, message)
+                    sent += 1
+                    logger.info(f"Email sent successfully to {recipient_email}")
+                except smtplib.SMTPRecipientsRefused as e:
+                    # One bad address should not stop the rest of the batch
+                    logger.error(f"Failed to send email to {recipient_email}: {str(e)}")
+    except Exception as e:
+        logger.error(f"Failed to send email batch ({sent}/{len(recipient_emails)} sent): {str(e)}")
+    return sent
+
 def send_otp_email(email: str, otp: str, name: str = None) -> bool:
     """
     Send OTP verification email to manager
@@ -129,15 +193,14 @@ def send_employee_verification_email(email: str, manager_name: str, company_name
 
 
 
-def send_meeting_notification(
-    email: str,
+def meeting_notification_content(
     meeting_title: str,
     meeting_date: Union[datetime, List[datetime]],  # Can be a single date or list of dates
     meeting_location: str,
     created_by: str,
     is_request: bool = False
-) -> bool:
-    """Send meeting notification email"""
+) -> Tuple[str, str, str]:
+    """Build the (subject, html, text) of a meeting notification email"""
     # Handle single date or multiple proposed dates
     if isinstance(meeting_date, list):
         # Format multiple proposed dates
@@ -190,17 +253,45 @@ def send_meeting_notification(
     Please log in to your account to view more details or respond to this meeting.
     """
 
-    return send_email(email, subject, html_content, text_content)
+    return subject, html_content, text_content
 
-def send_meeting_status_update(
+def send_meeting_notification(
     email: str,
+    meeting_title: str,
+    meeting_date: Union[datetime, List[datetime]],  # Can be a single date or list of dates
+    meeting_location: str,
+    created_by: str,
+    is_request: bool = False
+) -> bool:
+    """Send meeting notification email"""
+    subject, html_content, text_content = meeting_notification_content(
+        meeting_title, meeting_date, meeting_location, created_by, is_request
+    )
+    return send_email(email, subject, html_content, text_content)
+
+def send_meeting_notification_bulk(
+    emails: List[str],
+    meeting_title: str,
+    meeting_date: Union[datetime, List[datetime]],
+    meeting_location: str,
+    created_by: str,
+    is_request: bool = False
+) -> int:
+    """Send the same meeting notification to every attendee over one SMTP connection"""
+    subject, html_content, text_content = meeting_notification_content(
+        meeting_title, meeting_date, meeting_location, created_by, is_request
+    )
+    return send_bulk_email(emails, subject, html_content, text_content)
+
+def meeting_status_update_content(
     meeting_title: str,
     meeting_date: datetime,
     status: str,
     reason: Optional[str] = None
-) -> bool:
-    """Send meeting status update email"""
-    formatted_date = meeting_date.strftime("%A, %B %d, %Y at %I:%M %p")
+) -> Tuple[str, str, str]:
+    """Build the (subject, html, text) of a meeting status update email"""
+    # Employee-requested meetings have no date until one is selected
+    formatted_date = meeting_date.strftime("%A, %B %d, %Y at %I:%M %p") if meeting_date else "To be confirmed"
     
     status_map = {
         "accepted": "accepted",
@@ -243,8 +334,34 @@ def send_meeting_status_update(
     
     text_content += "\nPlease log in to your account to view more details."
     
+    return subject, html_content, text_content
+
+def send_meeting_status_update(
+    email: str,
+    meeting_title: str,
+    meeting_date: datetime,
+    status: str,
+    reason: Optional[str] = None
+) -> bool:
+    """Send meeting status update email"""
+    subject, html_content, text_content = meeting_status_update_content(
+        meeting_title, meeting_date, status, reason
+    )
     return send_email(email, subject, html_content, text_content)
 
+def send_meeting_status_update_bulk(
+    emails: List[str],
+    meeting_title: str,
+    meeting_date: datetime,
+    status: str,
+    reason: Optional[str] = None
+) -> int:
+    """Send the same status update to every attendee over one SMTP connection"""
+    subject, html_content, text_content = meeting_status_update_content(
+        meeting_title, meeting_date, status, reason
+    )
+    return send_bulk_email(emails, subject, html_content, text_content)
+
 def send_manager_approval_email(recipient_email: str, recipient_name: str):
     """
     Send an email notification when a manager's account is approved.
@@ -1,12 +1,56 @@
+from collections import OrderedDict
+import hashlib
+import hmac
+import threading
+
 from passlib.context import CryptContext
+from app.config import settings
+
+# Create a CryptContext for hashing and verifying passwords. The cost applies
+# to new hashes only; existing hashes carry their own rounds and still verify.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
 
-# Create a CryptContext for hashing and verifying passwords
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Successful (HMAC(password), hash) pairs seen by this worker. The plain text
+# is never stored, and because the stored hash is part of the key, setting a
+# new password invalidates the old entry without an explicit purge.
+VERIFIED_CACHE_SIZE = 1024
+verified_passwords: "OrderedDict[tuple, bool]" = OrderedDict()
+verified_passwords_lock = threading.Lock()
 
 def hash_password(password: str) -> str:
     """Hash a plain-text password."""
     return pwd_context.hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a plain-text password against a hashed password."""
-    return pwd_context.verify(plain_password, hashed_password)
\ No newline at end of file
+    """
+    Verify a plain-text password against a hashed password.
+
+    A pair that has already verified in this worker is answered from an LRU
+    without running bcrypt again; failures are never cached.
+    """
+    key = (
+        hmac.new(settings.SECRET_KEY.encode(), plain_password.encode(), hashlib.sha256).digest(),
+        hashed_password,
+    )
+    with verified_passwords_lock:
+        if key in verified_passwords:
+            verified_passwords.move_to_end(key)
+            return True
+
+    if not pwd_context.verify(plain_password, hashed_password):
+        return False
+
+    with verified_passwords_lock:
+        verified_passwords[key] = True
+        if len(verified_passwords) > VERIFIED_CACHE_SIZE:
+            verified_passwords.popitem(last=False)
+    return True
+
+def clear_password_cache() -> None:
+    """Drop every cached verification, e.g. after a bulk credential reset."""
+    with verified_passwords_lock:
+        verified_passwords.clear()
@@ -0,0 +1,56 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+
+from app.exceptions import ValidationException
+
+def escape_like(value: str, escape_char: str = "\\") -> str:
+    """
+    Escape LIKE/ILIKE wildcards in user input
+
+    Args:
+        value: Raw search term
+        escape_char: Escape character passed to ilike(..., escape=...)
+
+    Returns:
+        str: Search term matching literally inside a LIKE pattern
+    """
+    return (
+        value.replace(escape_char, escape_char * 2)
+        .replace("%", f"{escape_char}%")
+        .replace("_", f"{escape_char}_")
+    )
+
+def encode_cursor(sort_value: Optional[datetime], row_id: int) -> str:
+    """
+    Build an opaque keyset-pagination cursor from the last row of a page
+
+    Args:
+        sort_value: Value of the row's sort column (may be None)
+        row_id: Row ID, used as the tie-breaker
+
+    Returns:
+        str: URL-safe cursor string
+    """
+    payload = [sort_value.isoformat() if sort_value else None, row_id]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    """
+    Parse a cursor produced by encode_cursor
+
+    Args:
+        cursor: Cursor string from a previous response
+
+    Returns:
+        Tuple: (sort_value, row_id)
+
+    Raises:
+        ValidationException: If the cursor is malformed
+    """
+    try:
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return (datetime.fromisoformat(sort_value) if sort_value else None), int(row_id)
+    except (ValueError, TypeError):
+        raise ValidationException("Invalid cursor")
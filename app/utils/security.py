@@ -1,15 +1,12 @@
-from passlib.context import CryptContext
 from jose import jwt
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 import string
 from app.config import settings
-import random
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+from app.utils.password import pwd_context, verify_password
+import hashlib
+import hmac
+import secrets
 
 def get_password_hash(password):
     return pwd_context.hash(password)
@@ -18,9 +15,9 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
 
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = datetime.now(timezone.utc) + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        expire = datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
 
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
@@ -37,7 +34,33 @@ def generate_verification_token(length: int = 64) -> str:
         A random string token
     """
     chars = string.ascii_letters + string.digits
-    return ''.join(random.choices(chars, k=length))
+    return ''.join(secrets.choice(chars) for _ in range(length))
+
+def hash_otp(otp: str) -> str:
+    """
+    Hash a one-time password for storage
+
+    Args:
+        otp: Plain OTP as sent to the user
+
+    Returns:
+        str: Hex-encoded HMAC-SHA256 of the OTP, keyed with SECRET_KEY
+    """
+    # Keyed, since a plain digest of a 6-digit code is reversed by trying all
+    # 10^6 values
+    return hmac.new(settings.SECRET_KEY.encode(), otp.encode(), hashlib.sha256).hexdigest()
+
+def hash_verification_token(token: str) -> str:
+    """
+    Digest an employee verification token for storage and lookup
+
+    Args:
+        token: Plain token as sent in the invitation email
+
+    Returns:
+        str: Hex-encoded HMAC-SHA256 of the token, keyed with SECRET_KEY
+    """
+    return hmac.new(settings.SECRET_KEY.encode(), token.encode(), hashlib.sha256).hexdigest()
 
 def verify_token(token: str):
     return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
\ No newline at end of file
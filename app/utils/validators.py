@@ -5,6 +5,12 @@ import phonenumbers
 
 from app.exceptions import ValidationException
 
+# Patterns are compiled once at import rather than on every request
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+UPPERCASE_PATTERN = re.compile(r'[A-Z]')
+LOWERCASE_PATTERN = re.compile(r'[a-z]')
+DIGIT_PATTERN = re.compile(r'[0-9]')
+
 def validate_email(email: str) -> bool:
     """
     Validate email format
@@ -18,8 +24,7 @@ def validate_email(email: str) -> bool:
     Raises:
         ValidationException: If email is invalid
     """
-    email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    if not re.match(email_pattern, email):
+    if not EMAIL_PATTERN.match(email):
         raise ValidationException("Invalid email format")
     return True
 
@@ -72,13 +77,13 @@ def validate_password(password: str) -> bool:
     if len(password) < 8:
         raise ValidationException("Password must be at least 8 characters long")
     
-    if not re.search(r'[A-Z]', password):
+    if not UPPERCASE_PATTERN.search(password):
         raise ValidationException("Password must contain at least one uppercase letter")
     
-    if not re.search(r'[a-z]', password):
+    if not LOWERCASE_PATTERN.search(password):
         raise ValidationException("Password must contain at least one lowercase letter")
     
-    if not re.search(r'[0-9]', password):
+    if not DIGIT_PATTERN.search(password):
         raise ValidationException("Password must contain at least one digit")
     
     return True